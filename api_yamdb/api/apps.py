@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     name = "api"
     verbose_name = "Интеграция"
+
+    def ready(self):
+        import api.signals  # noqa: F401
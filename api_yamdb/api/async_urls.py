@@ -0,0 +1,8 @@
+from django.urls import include, path
+
+from api.urls import get_urls_v1
+
+
+urlpatterns = [
+    path("v1/", include(get_urls_v1(async_reads=True))),
+]
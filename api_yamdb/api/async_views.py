@@ -0,0 +1,85 @@
+import time
+from contextlib import nullcontext
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connection
+from django.urls import URLPattern
+from rest_framework.permissions import SAFE_METHODS
+
+
+# Маршруты router_v1, которые при ASYNC_READS обслуживаются асинхронно.
+ASYNC_READ_ROUTES = (
+    "categories-list",
+    "genres-list",
+    "titles-list",
+    "titles-detail",
+    "reviews-list",
+    "comments-list",
+)
+
+
+def read(view, request, *args, **kwargs):
+    """Обработать запрос на чтение в отдельном потоке.
+
+    Поток пула сам открывает и закрывает соединения с БД, как это делают
+    сигналы начала и конца запроса. Ответ рендерится здесь же, чтобы
+    сериализация тоже не занимала общий поток обработчика. Запросы к БД и
+    рендеринг учитываются в QueryInstrumentationMiddleware.
+    """
+    instrumentation = getattr(request, "instrumentation", None)
+    # execute_wrapper действует только на соединение текущего потока.
+    queries = (
+        connection.execute_wrapper(instrumentation["queries"])
+        if instrumentation
+        else nullcontext()
+    )
+    close_old_connections()
+    try:
+        with queries:
+            response = view(request, *args, **kwargs)
+            if callable(getattr(response, "render", None)):
+                started = time.perf_counter()
+                response.render()
+                if instrumentation:
+                    instrumentation["render"] = (
+                        time.perf_counter() - started
+                    )
+        return response
+    finally:
+        close_old_connections()
+
+
+def as_async_view(view):
+    """Обернуть представление в асинхронное.
+
+    В Django 3.2 нет асинхронного ORM, а синхронные представления под
+    ASGI выполняются по очереди в одном потоке. Запросы на чтение
+    выполняются в пуле потоков параллельно, остальные запросы —
+    как обычно.
+    """
+    read_async = sync_to_async(read, thread_sensitive=False)
+    write_async = sync_to_async(view, thread_sensitive=True)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return await read_async(view, request, *args, **kwargs)
+        return await write_async(request, *args, **kwargs)
+
+    return async_view
+
+
+def as_async_reads(urlpatterns):
+    """Заменить представления ASYNC_READ_ROUTES на асинхронные."""
+    return [
+        URLPattern(
+            pattern.pattern,
+            as_async_view(pattern.callback),
+            pattern.default_args,
+            pattern.name,
+        )
+        if pattern.name in ASYNC_READ_ROUTES
+        else pattern
+        for pattern in urlpatterns
+    ]
@@ -0,0 +1,110 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+User = get_user_model()
+
+# Поля пользователя, которые записываются в токен.
+CLAIM_FIELDS = ("username", "role", "is_superuser")
+
+# Состояние пользователей из БД: id -> (время устаревания, состояние).
+_user_states = {}
+_user_states_lock = threading.Lock()
+
+
+class RoleAccessToken(AccessToken):
+    """Токен доступа с именем и ролью пользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for field in CLAIM_FIELDS:
+            token[field] = getattr(user, field)
+        return token
+
+
+def get_user_state(user_id):
+    """Получить роль и активность пользователя из БД.
+
+    Ответ хранится в памяти процесса JWT_ROLE_CACHE_TIMEOUT секунд,
+    поэтому отзыв роли вступает в силу не позже, чем через это время.
+    """
+    now = time.monotonic()
+    with _user_states_lock:
+        expires, state = _user_states.get(user_id, (0, None))
+    if expires > now:
+        return state
+    state = (
+        User.objects.filter(pk=user_id)
+        .values_list(*CLAIM_FIELDS[1:], "is_active")
+        .first()
+    )
+    with _user_states_lock:
+        if len(_user_states) >= settings.JWT_ROLE_CACHE_SIZE:
+            _user_states.clear()
+        _user_states[user_id] = (
+            now + settings.JWT_ROLE_CACHE_TIMEOUT,
+            state,
+        )
+    return state
+
+
+def forget_user_state(user_id):
+    """Удалить состояние пользователя из кэша процесса."""
+    with _user_states_lock:
+        _user_states.pop(user_id, None)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Аутентификация по токену без загрузки пользователя из БД.
+
+    Пользователь собирается из claims токена RoleAccessToken, остальные
+    поля модели отложены и загружаются при первом обращении. Токены без
+    claims обрабатываются как в JWTAuthentication.
+    """
+
+    def get_user(self, validated_token):
+        if any(field not in validated_token for field in CLAIM_FIELDS):
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        state = get_user_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(
+                "Пользователь не найден", code="user_not_found"
+            )
+        *claims, is_active = state
+        if not is_active:
+            raise AuthenticationFailed(
+                "Пользователь неактивен", code="user_inactive"
+            )
+        if tuple(claims) != tuple(
+            validated_token[field] for field in CLAIM_FIELDS[1:]
+        ):
+            raise AuthenticationFailed(
+                "Роль пользователя изменилась, получите новый токен",
+                code="token_revoked",
+            )
+        values = {
+            api_settings.USER_ID_FIELD: user_id,
+            "is_active": is_active,
+            **{field: validated_token[field] for field in CLAIM_FIELDS},
+        }
+        # from_db ждёт значения в порядке полей модели.
+        fields = [
+            field.attname
+            for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            router.db_for_read(User),
+            fields,
+            [values[field] for field in fields],
+        )
@@ -0,0 +1,107 @@
+import time
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+HITS_KEY = "api:stats:hits"
+MISSES_KEY = "api:stats:misses"
+
+
+def get_cache():
+    """Получить кэш, выбранный для ответов API."""
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def get_version(namespace, validator=None):
+    """Получить текущую версию ключей группы ответов.
+
+    validator - дешёвое значение из БД (например, счётчик родительского
+    объекта). Если оно изменилось без сигналов (QuerySet.update,
+    bulk_create), версия группы сменяется.
+    """
+    cache = get_cache()
+    key = f"api:{namespace}:version"
+    entry = cache.get(key)
+    if entry is None:
+        entry = (time.time_ns(), validator)
+        # Версию мог успеть записать другой процесс.
+        if not cache.add(key, entry, settings.API_CACHE_VERSION_TIMEOUT):
+            entry = cache.get(key) or entry
+    version, saved_validator = entry
+    if validator is not None and saved_validator != validator:
+        if saved_validator is not None:
+            # Данные изменились в обход сигналов.
+            version = time.time_ns()
+        cache.set(
+            key, (version, validator), settings.API_CACHE_VERSION_TIMEOUT
+        )
+    return version
+
+
+def invalidate(*namespaces):
+    """Сбросить закэшированные ответы групп сменой их версии."""
+    for namespace in namespaces:
+        get_cache().set(
+            f"api:{namespace}:version",
+            (time.time_ns(), None),
+            settings.API_CACHE_VERSION_TIMEOUT,
+        )
+
+
+def get_query_string(request, exclude=()):
+    """Получить упорядоченные параметры запроса без параметров exclude."""
+    return urlencode(
+        sorted(
+            (key, sorted(values))
+            for key, values in request.query_params.lists()
+            if key not in exclude
+        ),
+        doseq=True,
+    )
+
+
+def get_request_digest(request):
+    """Получить хэш пути, формата и упорядоченных параметров запроса."""
+    query = get_query_string(request)
+    return md5(
+        f"{request.path}?{query}#{request.accepted_renderer.format}".encode()
+    ).hexdigest()
+
+
+def get_cache_key(namespace, request):
+    """Построить ключ ответа в текущей версии группы."""
+    return (
+        f"api:{namespace}:{get_version(namespace)}:"
+        f"{get_request_digest(request)}"
+    )
+
+
+def get_count_key(namespace, request, exclude=()):
+    """Построить ключ количества объектов списка с фильтрами запроса."""
+    digest = md5(
+        f"{request.path}?{get_query_string(request, exclude)}".encode()
+    ).hexdigest()
+    return f"api:{namespace}:{get_version(namespace)}:count:{digest}"
+
+
+def count(key):
+    """Увеличить счётчик попаданий или промахов кэша."""
+    cache = get_cache()
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Счётчик мог быть вытеснен из кэша между add и incr.
+        cache.set(key, 1, None)
+
+
+def get_stats():
+    """Получить счётчики попаданий и промахов кэша."""
+    stats = get_cache().get_many((HITS_KEY, MISSES_KEY))
+    return {
+        "hits": stats.get(HITS_KEY, 0),
+        "misses": stats.get(MISSES_KEY, 0),
+    }
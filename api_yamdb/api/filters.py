@@ -1,6 +1,66 @@
 import django_filters
+from rest_framework import filters
 
 from reviews.models import Title
+from reviews.search import get_search_backend
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """Ищет через поисковый индекс, ?ordering=relevance - по релевантности."""
+
+    relevance_ordering = "relevance"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        return get_search_backend().search(
+            queryset,
+            query,
+            ranked=request.query_params.get("ordering")
+            == self.relevance_ordering,
+        )
+
+
+class TitleOrderingFilter(filters.OrderingFilter):
+    """Сортирует произведения по сохранённым полям с индексами.
+
+    Последним полем добавляется id в направлении, обратном первому полю,
+    чтобы порядок совпадал с индексом ("-<поле>", "id") при обходе в любую
+    сторону. ?ordering=relevance оставляет порядок FullTextSearchFilter.
+    """
+
+    # Параметр сортировки и поле модели.
+    fields = {
+        "rating": "rating_avg",
+        "review_count": "rating_count",
+        "year": "year",
+        "name": "name",
+    }
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param, "")
+        ordering = []
+        for term in params.split(","):
+            term = term.strip()
+            field = self.fields.get(term.lstrip("-"))
+            if field:
+                ordering.append(f"-{field}" if term[0] == "-" else field)
+        if not ordering:
+            return self.get_default_ordering(view)
+        ordering.append("id" if ordering[0][0] == "-" else "-id")
+        return tuple(ordering)
+
+    def filter_queryset(self, request, queryset, view):
+        if (
+            request.query_params.get(self.ordering_param)
+            == FullTextSearchFilter.relevance_ordering
+        ):
+            return queryset
+        return queryset.order_by(*self.get_ordering(request, queryset, view))
+
+    def get_valid_fields(self, queryset, view, context={}):
+        return [(field, field) for field in self.fields]
 
 
 class TitleFilter(django_filters.FilterSet):
@@ -8,10 +68,27 @@ class TitleFilter(django_filters.FilterSet):
     category = django_filters.CharFilter(
         field_name="category", lookup_expr="slug"
     )
-    name = django_filters.CharFilter(
-        field_name="name", lookup_expr="icontains"
-    )
+    name = django_filters.CharFilter(method="filter_name")
+    rating_min = django_filters.NumberFilter(method="filter_rating")
+    rating_max = django_filters.NumberFilter(method="filter_rating")
 
     class Meta:
         model = Title
-        fields = ("genre", "category", "year", "name")
+        fields = (
+            "genre",
+            "category",
+            "year",
+            "name",
+            "rating_min",
+            "rating_max",
+        )
+
+    def filter_name(self, queryset, name, value):
+        return get_search_backend().search(queryset, value)
+
+    def filter_rating(self, queryset, name, value):
+        """Отобрать произведения с оценками по диапазону средней оценки."""
+        lookup = "gte" if name == "rating_min" else "lte"
+        return queryset.filter(
+            rating_count__gt=0, **{f"rating_avg__{lookup}": value}
+        )
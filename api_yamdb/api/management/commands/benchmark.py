@@ -0,0 +1,283 @@
+import json
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from io import StringIO
+from statistics import mean
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.urls import router_v1
+from reviews.models import Comment, Genre, Title
+
+
+User = get_user_model()
+
+# Сценарии: имя, метод, адрес и данные запроса. Имена эндпоинтов router_v1
+# начинаются с basename, по нему проверяется, что покрыт каждый маршрут.
+SCENARIOS = (
+    ("api-root", "GET", "/api/v1/", None),
+    ("categories-list", "GET", "/api/v1/categories/", None),
+    ("genres-list", "GET", "/api/v1/genres/", None),
+    ("titles-list", "GET", "/api/v1/titles/", None),
+    ("titles-list-genre", "GET", "/api/v1/titles/?genre={genre}", None),
+    ("titles-list-search", "GET", "/api/v1/titles/?search={word}", None),
+    (
+        "titles-list-rating",
+        "GET",
+        "/api/v1/titles/?ordering=-rating&rating_min=5",
+        None,
+    ),
+    ("titles-detail", "GET", "/api/v1/titles/{title}/", None),
+    ("titles-top", "GET", "/api/v1/titles/top/", None),
+    ("titles-top-genre", "GET", "/api/v1/titles/top/?genre={genre}", None),
+    ("users-list", "GET", "/api/v1/users/", None),
+    ("users-detail", "GET", "/api/v1/users/{username}/", None),
+    ("users-me", "GET", "/api/v1/users/me/", None),
+    ("reviews-list", "GET", "/api/v1/titles/{title}/reviews/", None),
+    (
+        "reviews-list-cursor",
+        "GET",
+        "/api/v1/titles/{title}/reviews/?cursor=",
+        None,
+    ),
+    (
+        "reviews-detail",
+        "GET",
+        "/api/v1/titles/{title}/reviews/{review}/",
+        None,
+    ),
+    (
+        "comments-list",
+        "GET",
+        "/api/v1/titles/{title}/reviews/{review}/comments/",
+        None,
+    ),
+    (
+        "comments-detail",
+        "GET",
+        "/api/v1/titles/{title}/reviews/{review}/comments/{comment}/",
+        None,
+    ),
+    (
+        "auth-signup",
+        "POST",
+        "/api/v1/auth/signup/",
+        {"username": "{username}", "email": "{email}"},
+    ),
+    (
+        "auth-token",
+        "POST",
+        "/api/v1/auth/token/",
+        {"username": "{username}", "confirmation_code": "{code}"},
+    ),
+)
+
+
+def percentile(values, fraction):
+    """Получить перцентиль отсортированного списка."""
+    return values[min(len(values) - 1, round(fraction * (len(values) - 1)))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Измеряет задержку, число запросов к БД и выделение памяти для "
+        "каждого эндпоинта API на сгенерированных данных в тестовой БД."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--titles", type=int, default=500)
+        parser.add_argument("--max-reviews-per-title", type=int, default=300)
+        parser.add_argument("--comments-per-review", type=float, default=2.0)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument(
+            "--cold-cache",
+            action="store_true",
+            help="Очищать кэш ответов перед каждым запросом.",
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark.json",
+            help="Файл для результатов в формате JSON.",
+        )
+
+    def handle(self, *args, **options):
+        """Создать тестовую БД, заполнить её и измерить эндпоинты."""
+        self.check_coverage()
+        if options["iterations"] < 1:
+            raise CommandError("--iterations должен быть больше нуля.")
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True
+        )
+        try:
+            # Ограничения частоты отключены, иначе повторы получат 429.
+            # Свой кэш, чтобы не смешивать ответы тестовой БД с общим кэшем
+            # сервера и не очищать его при --cold-cache.
+            with override_settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": (
+                            "django.core.cache.backends.locmem.LocMemCache"
+                        ),
+                        "LOCATION": "benchmark",
+                    },
+                    "throttle": {
+                        "BACKEND": (
+                            "django.core.cache.backends.dummy.DummyCache"
+                        ),
+                    },
+                },
+                EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+                REST_FRAMEWORK={
+                    **settings.REST_FRAMEWORK,
+                    "DEFAULT_THROTTLE_RATES": {},
+                },
+            ):
+                self.seed(options)
+                results = [
+                    self.measure(scenario, options)
+                    for scenario in SCENARIOS
+                ]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        report = {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "options": {
+                key: options[key]
+                for key in (
+                    "users",
+                    "titles",
+                    "max_reviews_per_title",
+                    "comments_per_review",
+                    "seed",
+                    "iterations",
+                    "cold_cache",
+                )
+            },
+            "results": results,
+        }
+        with open(options["output"], "w", encoding="utf-8") as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+        self.stdout.write(
+            self.style.SUCCESS(f"Результаты: {options['output']}")
+        )
+
+    def check_coverage(self):
+        """Убедиться, что для каждого маршрута router_v1 есть сценарий."""
+        names = {name for name, _, _, _ in SCENARIOS}
+        missing = [
+            basename
+            for _, _, basename in router_v1.registry
+            if not any(name.startswith(f"{basename}-") for name in names)
+        ]
+        if missing:
+            raise CommandError(f"Нет сценариев для маршрутов: {missing}")
+
+    def seed(self, options):
+        """Заполнить тестовую БД и подготовить параметры сценариев."""
+        call_command(
+            "generate_fake_data",
+            users=options["users"],
+            titles=options["titles"],
+            max_reviews_per_title=options["max_reviews_per_title"],
+            comments_per_review=options["comments_per_review"],
+            seed=options["seed"],
+            stdout=StringIO(),
+        )
+        admin = User.objects.create_user(
+            username="benchmark_admin",
+            email="benchmark_admin@yamdb.fake",
+            role=User.ADMIN,
+        )
+        # Вложенные сценарии используют самое популярное произведение.
+        comment = (
+            Comment.objects.filter(
+                review__title=Title.objects.order_by("-rating_count").first()
+            )
+            .select_related("review")
+            .first()
+        )
+        if comment is None:
+            raise CommandError("Сгенерировано слишком мало комментариев.")
+        self.context = {
+            "genre": Genre.objects.first().slug,
+            "word": Title.objects.first().name.split()[0],
+            "title": comment.review.title_id,
+            "review": comment.review_id,
+            "comment": comment.id,
+            "username": admin.username,
+            "email": admin.email,
+            "code": default_token_generator.make_token(admin),
+        }
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin)}"
+        )
+
+    def request(self, method, url, data):
+        return self.client.generic(
+            method,
+            url,
+            json.dumps(data) if data else "",
+            content_type="application/json",
+        )
+
+    def measure(self, scenario, options):
+        """Измерить один сценарий."""
+        name, method, url, data = scenario
+        url = url.format(**self.context)
+        if data:
+            data = {
+                key: value.format(**self.context)
+                for key, value in data.items()
+            }
+        # Прогрев, чтобы не учитывать первичную инициализацию.
+        response = self.request(method, url, data)
+        timings = []
+        queries = []
+        for _ in range(options["iterations"]):
+            if options["cold_cache"]:
+                cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = self.request(method, url, data)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(context.captured_queries))
+        if options["cold_cache"]:
+            cache.clear()
+        tracemalloc.start()
+        self.request(method, url, data)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        timings.sort()
+        result = {
+            "name": name,
+            "method": method,
+            "url": url,
+            "status": response.status_code,
+            "p50_ms": round(percentile(timings, 0.5), 3),
+            "p95_ms": round(percentile(timings, 0.95), 3),
+            "mean_ms": round(mean(timings), 3),
+            "queries": max(queries),
+            "alloc_peak_kb": round(peak / 1024, 1),
+        }
+        self.stdout.write(
+            f"{name}: p50 {result['p50_ms']} мс, p95 {result['p95_ms']} мс, "
+            f"запросов {result['queries']}, "
+            f"память {result['alloc_peak_kb']} КБ"
+        )
+        return result
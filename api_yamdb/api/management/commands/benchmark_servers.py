@@ -0,0 +1,272 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from importlib.util import find_spec
+from statistics import mean
+from urllib.request import urlopen
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.async_views import ASYNC_READ_ROUTES
+from api.management.commands.benchmark import percentile
+from reviews.models import Comment, Genre, Title
+
+
+# Сервер: имя, модуль и обслуживаются ли чтения асинхронно (ASYNC_READS).
+SERVERS = (
+    ("uvicorn-async", "uvicorn", True),
+    ("uvicorn-sync", "uvicorn", False),
+    ("gunicorn-sync", "gunicorn", False),
+)
+
+# Сценарии по маршрутам ASYNC_READ_ROUTES.
+SCENARIOS = (
+    ("categories-list", "/api/v1/categories/"),
+    ("genres-list", "/api/v1/genres/"),
+    ("titles-list", "/api/v1/titles/?genre={genre}"),
+    ("titles-detail", "/api/v1/titles/{title}/"),
+    ("reviews-list", "/api/v1/titles/{title}/reviews/"),
+    ("comments-list", "/api/v1/titles/{title}/reviews/{review}/comments/"),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает пропускную способность запросов на чтение под uvicorn "
+        "(асинхронные и синхронные представления) и gunicorn с синхронными "
+        "воркерами при медленной БД. Использует данные текущей БД."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--servers",
+            nargs="+",
+            choices=[name for name, _, _ in SERVERS],
+            default=[name for name, _, _ in SERVERS],
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=32,
+            help="Число одновременных запросов.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Число запросов на каждый сценарий.",
+        )
+        parser.add_argument(
+            "--query-delay",
+            type=float,
+            default=0.02,
+            help="Задержка каждого запроса к БД в секундах.",
+        )
+        parser.add_argument(
+            "--gunicorn-workers",
+            type=int,
+            default=4,
+            help="Число синхронных воркеров gunicorn.",
+        )
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--startup-timeout",
+            type=float,
+            default=30,
+            help="Сколько секунд ждать запуска сервера.",
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark_servers.json",
+            help="Файл для результатов в формате JSON.",
+        )
+
+    def handle(self, *args, **options):
+        """Запустить каждый сервер и нагрузить его сценариями."""
+        self.check_coverage()
+        if options["concurrency"] < 1 or options["requests"] < 1:
+            raise CommandError(
+                "--concurrency и --requests должны быть больше нуля."
+            )
+        servers = [
+            server for server in SERVERS if server[0] in options["servers"]
+        ]
+        missing = sorted(
+            {module for _, module, _ in servers if find_spec(module) is None}
+        )
+        if missing:
+            raise CommandError(
+                f"Не установлены: {', '.join(missing)}. "
+                f"Установите: pip install {' '.join(missing)}"
+            )
+        context = self.get_context()
+        results = []
+        for server in servers:
+            with self.run_server(server, options):
+                for name, url in SCENARIOS:
+                    results.append(
+                        self.measure(server[0], name, url, context, options)
+                    )
+        report = {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "django": django.get_version(),
+            "options": {
+                key: options[key]
+                for key in (
+                    "concurrency",
+                    "requests",
+                    "query_delay",
+                    "gunicorn_workers",
+                )
+            },
+            "results": results,
+        }
+        with open(options["output"], "w", encoding="utf-8") as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+        self.stdout.write(
+            self.style.SUCCESS(f"Результаты: {options['output']}")
+        )
+
+    def check_coverage(self):
+        """Убедиться, что для каждого асинхронного маршрута есть сценарий."""
+        missing = set(ASYNC_READ_ROUTES) - {name for name, _ in SCENARIOS}
+        if missing:
+            raise CommandError(f"Нет сценариев для маршрутов: {missing}")
+
+    def get_context(self):
+        """Получить параметры сценариев из данных текущей БД."""
+        comment = (
+            Comment.objects.filter(
+                review__title=Title.objects.order_by("-rating_count").first()
+            )
+            .select_related("review")
+            .first()
+        )
+        if comment is None:
+            raise CommandError(
+                "В БД нет комментариев, заполните её командой "
+                "generate_fake_data."
+            )
+        return {
+            "genre": Genre.objects.first().slug,
+            "title": comment.review.title_id,
+            "review": comment.review_id,
+        }
+
+    def get_command(self, module, options):
+        """Получить команду запуска сервера."""
+        address = f"127.0.0.1:{options['port']}"
+        if module == "uvicorn":
+            return [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "api_yamdb.benchmark:asgi_application",
+                "--port",
+                str(options["port"]),
+                "--no-access-log",
+            ]
+        return [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "api_yamdb.benchmark:wsgi_application",
+            "--bind",
+            address,
+            "--workers",
+            str(options["gunicorn_workers"]),
+            "--worker-class",
+            "sync",
+        ]
+
+    def run_server(self, server, options):
+        """Запустить сервер и вернуть контекст, останавливающий его."""
+        name, module, async_reads = server
+        env = {
+            **os.environ,
+            "ASYNC_READS": "1" if async_reads else "0",
+            "DB_QUERY_DELAY": str(options["query_delay"]),
+            # Без кэша ответов каждый запрос доходит до БД.
+            "CACHE_BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        }
+        process = subprocess.Popen(
+            self.get_command(module, options),
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        return ServerProcess(name, process, options)
+
+    def measure(self, server, name, url, context, options):
+        """Измерить один сценарий при одновременных запросах."""
+        url = f"http://127.0.0.1:{options['port']}{url.format(**context)}"
+
+        def fetch(_):
+            started = time.perf_counter()
+            try:
+                with urlopen(url, timeout=60) as response:
+                    response.read()
+                    ok = response.status == 200
+            except OSError:
+                ok = False
+            return (time.perf_counter() - started) * 1000, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            responses = list(pool.map(fetch, range(options["requests"])))
+        duration = time.perf_counter() - started
+        timings = sorted(timing for timing, _ in responses)
+        result = {
+            "server": server,
+            "name": name,
+            "url": url,
+            "rps": round(len(responses) / duration, 1),
+            "p50_ms": round(percentile(timings, 0.5), 3),
+            "p95_ms": round(percentile(timings, 0.95), 3),
+            "mean_ms": round(mean(timings), 3),
+            "errors": sum(not ok for _, ok in responses),
+        }
+        self.stdout.write(
+            f"{server} {name}: {result['rps']} запросов/с, "
+            f"p50 {result['p50_ms']} мс, p95 {result['p95_ms']} мс, "
+            f"ошибок {result['errors']}"
+        )
+        return result
+
+
+class ServerProcess:
+    """Ждёт запуска сервера и останавливает его при выходе из контекста."""
+
+    def __init__(self, name, process, options):
+        self.name = name
+        self.process = process
+        self.url = f"http://127.0.0.1:{options['port']}/api/v1/"
+        self.timeout = options["startup_timeout"]
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CommandError(f"Сервер {self.name} завершился.")
+            try:
+                with urlopen(self.url, timeout=1):
+                    return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise CommandError(f"Сервер {self.name} не запустился.")
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import get_stats
+
+
+class Command(BaseCommand):
+    help = "Показывает счётчики попаданий и промахов кэша ответов API."
+
+    def handle(self, *args, **options):
+        """Вывести счётчики кэша."""
+        stats = get_stats()
+        self.stdout.write(f"hits: {stats['hits']}")
+        self.stdout.write(f"misses: {stats['misses']}")
@@ -0,0 +1,113 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from reviews.models import EmailOutbox
+
+
+# Время, на которое взятые в работу письма скрыты от других процессов.
+LEASE = timedelta(minutes=5)
+
+
+def claim_batch(batch_size):
+    """Взять в работу пачку писем, готовых к отправке."""
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True).filter(
+                sent_at__isnull=True,
+                next_attempt_at__lte=now,
+                attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            )[:batch_size]
+        )
+        EmailOutbox.objects.filter(
+            id__in=[email.id for email in emails]
+        ).update(next_attempt_at=now + LEASE)
+    return emails
+
+
+def send_batch(emails):
+    """Отправить письма через одно SMTP-соединение.
+
+    Возвращает число отправленных писем, неудачные откладываются.
+    """
+    sent = []
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for email in emails:
+            try:
+                connection.send_messages(
+                    [
+                        EmailMessage(
+                            email.subject,
+                            email.message,
+                            settings.DEFAULT_FROM_EMAIL,
+                            [email.recipient],
+                            connection=connection,
+                        )
+                    ]
+                )
+            except Exception as error:
+                postpone(email, error)
+            else:
+                sent.append(email.id)
+    except Exception as error:
+        # Соединение не открылось, откладываются все неотправленные письма.
+        for email in emails:
+            if email.id not in sent:
+                postpone(email, error)
+    finally:
+        connection.close()
+    EmailOutbox.objects.filter(id__in=sent).update(sent_at=timezone.now())
+    return len(sent)
+
+
+def postpone(email, error):
+    """Отложить письмо с экспоненциально растущей задержкой."""
+    email.attempts += 1
+    email.last_error = str(error)
+    email.next_attempt_at = timezone.now() + timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+    )
+    email.save(update_fields=("attempts", "last_error", "next_attempt_at"))
+
+
+class Command(BaseCommand):
+    help = "Отправляет письма из очереди EmailOutbox пачками."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Работать постоянно, проверяя очередь с интервалом.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Пауза в секундах, когда очередь пуста.",
+        )
+
+    def handle(self, *args, **options):
+        """Отправить письма из очереди."""
+        while True:
+            emails = claim_batch(options["batch_size"])
+            if emails:
+                sent = send_batch(emails)
+                self.stdout.write(f"Отправлено {sent} из {len(emails)}")
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS("Очередь писем обработана!"))
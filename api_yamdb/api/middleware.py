@@ -0,0 +1,114 @@
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Считает запросы к БД и их время через execute_wrapper."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            if duration >= self.slowest_duration:
+                self.slowest_duration = duration
+                self.slowest_sql = sql
+
+
+class QueryInstrumentationMiddleware:
+    """Измеряет запросы к БД, сериализацию и рендеринг каждого запроса.
+
+    Сериализацию данных учитывает TimedSerializerMixin, рендеринг - время
+    преобразования готовых данных в JSON.
+
+    Результат отдаётся в заголовке Server-Timing и пишется в лог,
+    запросы сверх QUERY_BUDGETS представления логируются как warning.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        # Асинхронные представления берут stats отсюда для своего потока.
+        request.instrumentation = {
+            "view": None,
+            "serialize": 0.0,
+            "render": 0.0,
+            "queries": stats,
+        }
+        started = time.perf_counter()
+        with connection.execute_wrapper(stats):
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+        serialize = request.instrumentation["serialize"]
+        render = request.instrumentation["render"]
+        view = request.instrumentation["view"]
+        budget = settings.QUERY_BUDGETS.get(
+            view, settings.QUERY_BUDGETS.get("default")
+        )
+        over_budget = budget is not None and stats.count > budget
+        response["Server-Timing"] = ", ".join(
+            (
+                f'db;dur={stats.duration * 1000:.2f};'
+                f'desc="{stats.count} queries"',
+                f"serialize;dur={serialize * 1000:.2f}",
+                f"render;dur={render * 1000:.2f}",
+                f"total;dur={total * 1000:.2f}",
+            )
+        )
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "view": view,
+            "queries": stats.count,
+            "query_budget": budget,
+            "db_ms": round(stats.duration * 1000, 2),
+            "slowest_query_ms": round(stats.slowest_duration * 1000, 2),
+            "slowest_query": stats.slowest_sql,
+            "serialize_ms": round(serialize * 1000, 2),
+            "render_ms": round(render * 1000, 2),
+            "total_ms": round(total * 1000, 2),
+        }
+        logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            json.dumps(record, ensure_ascii=False),
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Запомнить класс представления, обрабатывающего запрос."""
+        view_class = getattr(view_func, "cls", None)
+        request.instrumentation["view"] = (
+            view_class.__name__ if view_class else view_func.__name__
+        )
+
+    def process_template_response(self, request, response):
+        """Измерить время рендеринга ответа."""
+        if response.is_rendered:
+            # Асинхронное представление отрендерило ответ в своём потоке.
+            return response
+        started = time.perf_counter()
+
+        def finish_render(response):
+            request.instrumentation["render"] = time.perf_counter() - started
+
+        response.add_post_render_callback(finish_render)
+        return response
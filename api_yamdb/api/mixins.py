@@ -1,9 +1,123 @@
-from rest_framework import filters, mixins, viewsets
+import time
 
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import filters, mixins, status, viewsets
+from rest_framework.response import Response
+
+from api.cache import (
+    HITS_KEY,
+    MISSES_KEY,
+    count,
+    get_cache,
+    get_cache_key,
+    get_request_digest,
+    get_version,
+)
 from api.permissions import IsAdminOrReadOnly
+from api.throttling import IPRateThrottle, UsernameRateThrottle
+
+
+class ReadResponseMixin:
+    """Общая точка обработки запросов на чтение."""
+
+    cache_namespace = None
+
+    def get_cache_namespace(self):
+        """Получить группу, к которой относятся ответы представления."""
+        return self.cache_namespace
+
+    def read_response(self, handler, request, *args, **kwargs):
+        """Получить ответ на запрос на чтение."""
+        return handler(request, *args, **kwargs)
+
+
+class ReadListMixin(ReadResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.read_response(super().list, request, *args, **kwargs)
+
+
+class ReadRetrieveMixin(ReadResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.read_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class CachedResponseMixin(ReadResponseMixin):
+    """Отдаёт ответы на чтение из кэша группы cache_namespace."""
+
+    def read_response(self, handler, request, *args, **kwargs):
+        """Вернуть ответ из кэша или получить и сохранить его."""
+        key = get_cache_key(self.get_cache_namespace(), request)
+        data = get_cache().get(key)
+        if data is not None:
+            count(HITS_KEY)
+            return Response(data, headers={"X-Cache": "HIT"})
+        count(MISSES_KEY)
+        response = super().read_response(handler, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            get_cache().set(key, response.data, settings.API_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class ConditionalResponseMixin(ReadResponseMixin):
+    """Отвечает 304, если версия группы ответов не изменилась.
+
+    Версия группы - время её последнего изменения, поэтому ETag и
+    Last-Modified вычисляются без сериализации: из кэша и дешёвого
+    значения get_validator.
+    """
+
+    def get_validator(self):
+        """Получить значение из БД, которое меняется вместе с ответами."""
+        return None
+
+    def read_response(self, handler, request, *args, **kwargs):
+        """Вернуть 304 или полный ответ с ETag и Last-Modified."""
+        version = get_version(
+            self.get_cache_namespace(), self.get_validator()
+        )
+        etag = quote_etag(f"{version}-{get_request_digest(request)}")
+        last_modified = version // 10 ** 9
+        # Last-Modified точен до секунды: изменение в ту же секунду
+        # его не сдвинет, поэтому для текущей секунды он не отдаётся.
+        if last_modified >= int(time.time()):
+            last_modified = None
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().read_response(
+                handler, request, *args, **kwargs
+            )
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class ThrottledCreateMixin:
+    """Ограничивает частоту только создания объектов."""
+
+    throttle_classes = (IPRateThrottle, UsernameRateThrottle)
+    throttle_scope = "write"
+
+    def get_throttles(self):
+        """Получить ограничения частоты для текущего действия."""
+        if self.action != "create":
+            return []
+        return super().get_throttles()
 
 
 class GetPostDeleteViewSet(
+    ConditionalResponseMixin,
+    CachedResponseMixin,
+    ReadListMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     mixins.ListModelMixin,
@@ -0,0 +1,211 @@
+import json
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    PageNumberPagination,
+)
+from rest_framework.settings import api_settings
+
+from api.cache import get_cache, get_count_key
+
+
+class CountedPaginator(Paginator):
+    """Paginator, получающий количество объектов из функции get_count."""
+
+    def __init__(self, object_list, per_page, get_count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.get_count = get_count
+
+    @cached_property
+    def count(self):
+        if self.get_count is None:
+            return super().count
+        return self.get_count()
+
+
+class CachedCountPagination(PageNumberPagination):
+    """Постраничная пагинация без COUNT(*) на каждый запрос.
+
+    Количество берётся из счётчика родительского объекта, если
+    представление умеет его вернуть через get_stored_count(), иначе
+    кэшируется по группе ответов представления и параметрам запроса.
+    Ключ содержит версию группы, поэтому сбрасывается теми же сигналами,
+    что и кэш ответов. Представления без группы считают точно.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = partial(
+            CountedPaginator,
+            get_count=partial(self.get_count, queryset, request, view),
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset, request, view):
+        """Получить количество объектов списка."""
+        # Параметры, от которых не зависит количество объектов.
+        exclude = (
+            self.page_query_param,
+            self.page_size_query_param,
+            api_settings.URL_FORMAT_OVERRIDE,
+        )
+        filtered = any(key not in exclude for key in request.query_params)
+        get_stored_count = getattr(view, "get_stored_count", None)
+        if get_stored_count is not None and not filtered:
+            return get_stored_count()
+        get_namespace = getattr(view, "get_cache_namespace", None)
+        namespace = get_namespace() if get_namespace else None
+        if namespace is None:
+            return queryset.count()
+        key = get_count_key(namespace, request, exclude)
+        count = get_cache().get(key)
+        if count is None:
+            count = queryset.count()
+            get_cache().set(key, count, settings.API_CACHE_TIMEOUT)
+        return count
+
+
+def get_keyset_filter(ordering, position):
+    """Получить условие «строго после позиции» для составного ключа.
+
+    Для сортировки (a, -b, c) это a > x OR (a = x AND b < y) OR
+    (a = x AND b = y AND c > z).
+    """
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, position):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+    return condition
+
+
+def reverse_ordering(ordering):
+    """Получить обратную сортировку."""
+    return tuple(
+        field[1:] if field.startswith("-") else f"-{field}"
+        for field in ordering
+    )
+
+
+class OptionalCursorPagination(CursorPagination):
+    """Курсорная пагинация по параметру ?cursor=, иначе постраничная.
+
+    В отличие от CursorPagination курсор хранит значения всех полей
+    сортировки, а не только первого, и страница выбирается условием по
+    составному ключу без OFFSET, даже если у многих строк совпадает первое
+    поле (год, нулевой рейтинг). Поэтому сортировка дополняется id.
+    """
+
+    page_number_pagination_class = CachedCountPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Выбрать способ пагинации по параметрам запроса."""
+        self.page_number_paginator = None
+        if self.cursor_query_param not in request.query_params:
+            self.page_number_paginator = self.page_number_pagination_class()
+            return self.page_number_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.decode_position(self.cursor)
+        ordering = (
+            reverse_ordering(self.ordering) if reverse else self.ordering
+        )
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(
+                    get_keyset_filter(ordering, position)
+                )
+            except (TypeError, ValueError, ValidationError):
+                # Значения поддельного курсора не подходят к полям.
+                raise NotFound(self.invalid_cursor_message)
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        """Получить сортировку, однозначную благодаря id."""
+        ordering = super().get_ordering(request, queryset, view)
+        if "id" not in (field.lstrip("-") for field in ordering):
+            ordering += ("id",)
+        return ordering
+
+    def decode_position(self, cursor):
+        """Получить значения полей сортировки из курсора."""
+        if cursor is None or cursor.position is None:
+            return None
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(
+            self.ordering
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_position(self, instance):
+        """Закодировать значения полей сортировки объекта."""
+        return json.dumps(
+            [getattr(instance, field.lstrip("-")) for field in self.ordering],
+            default=str,
+        )
+
+    def get_link(self, instance, reverse):
+        """Получить ссылку на страницу после или перед объектом."""
+        position = (
+            self.get_position(instance)
+            if instance is not None
+            else self.cursor.position
+        )
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=reverse, position=position)
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.get_link(self.page[-1] if self.page else None, False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.get_link(self.page[0] if self.page else None, True)
+
+    def get_paginated_response(self, data):
+        """Вернуть ответ в формате выбранной пагинации."""
+        if self.page_number_paginator is not None:
+            return self.page_number_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitlePagination(OptionalCursorPagination):
+    ordering = ("-year", "id")
+
+
+class ReviewCommentPagination(OptionalCursorPagination):
+    ordering = ("-pub_date", "id")
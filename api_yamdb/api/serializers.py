@@ -1,4 +1,8 @@
+import time
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 from rest_framework import serializers
 
 from reviews.models import Category, Comment, Genre, Review, Title
@@ -8,19 +12,43 @@ from reviews.numbers import DEFAULT_NUM, MAX_LEN_EMAIL, MAX_LEN_USERNAME
 User = get_user_model()
 
 
-class CategoriesSerializer(serializers.ModelSerializer):
+class TimedSerializerMixin:
+    """Учитывает время сериализации ответа в request.instrumentation.
+
+    Измеряется только корневой объект или элемент корневого списка:
+    вложенные сериализаторы входят во время внешнего.
+    """
+
+    def to_representation(self, instance):
+        request = self.context.get("request")
+        instrumentation = getattr(request, "instrumentation", None)
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if instrumentation is None or parent is not None:
+            return super().to_representation(instance)
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            instrumentation["serialize"] += time.perf_counter() - started
+
+
+class CategoriesSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Category
         exclude = ("id",)
 
 
-class GenresSerializer(serializers.ModelSerializer):
+class GenresSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         exclude = ("id",)
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
         slug_field="slug", queryset=Category.objects.all()
     )
@@ -32,26 +60,45 @@ class TitleSerializer(serializers.ModelSerializer):
         required=True,
     )
     rating = serializers.IntegerField(read_only=True, default=DEFAULT_NUM)
+    review_count = serializers.IntegerField(
+        source="rating_count", read_only=True
+    )
 
     class Meta:
         model = Title
-        fields = "__all__"
+        exclude = ("rating_sum", "rating_count", "rating_avg")
 
     def to_representation(self, instance):
         representation = super(TitleSerializer, self).to_representation(
             instance
         )
-        representation["genre"] = CategoriesSerializer(
+        # Жанры и категория берутся из prefetch_related/select_related.
+        representation["genre"] = GenresSerializer(
             instance.genre.all(), many=True
         ).data
         if instance.category:
-            representation["category"] = GenresSerializer(
+            representation["category"] = CategoriesSerializer(
                 instance.category
             ).data
         return representation
 
 
-class SignUpSerializer(serializers.ModelSerializer):
+class TopTitleSerializer(TitleSerializer):
+    weighted_rating = serializers.FloatField(read_only=True)
+
+
+class TopTitlesQuerySerializer(serializers.Serializer):
+    """Параметры запроса лучших произведений."""
+
+    category = serializers.SlugField(required=False)
+    genre = serializers.SlugField(required=False)
+    min_reviews = serializers.IntegerField(min_value=1, default=1)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=settings.TOP_TITLES_MAX_LIMIT, default=10
+    )
+
+
+class SignUpSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     username = serializers.RegexField(
         regex=r"^[\w.@+-]+\Z", max_length=MAX_LEN_USERNAME
     )
@@ -65,13 +112,27 @@ class SignUpSerializer(serializers.ModelSerializer):
         )
 
     def validate(self, data):
-        if User.objects.filter(
-            username=data.get("username"), email=data.get("email")
-        ).exists():
-            return data
-        if User.objects.filter(username=data.get("username")).exists():
+        """Проверить занятость имени и почты одним запросом.
+
+        Найденный пользователь с теми же именем и почтой сохраняется
+        в self.user, чтобы не искать его повторно.
+        """
+        self.user = None
+        username_taken = email_taken = False
+        for user in User.objects.filter(
+            Q(username=data.get("username")) | Q(email=data.get("email"))
+        ):
+            if (user.username, user.email) == (
+                data.get("username"),
+                data.get("email"),
+            ):
+                self.user = user
+                return data
+            username_taken |= user.username == data.get("username")
+            email_taken |= user.email == data.get("email")
+        if username_taken:
             raise serializers.ValidationError("Это имя уже занято")
-        if User.objects.filter(email=data.get("email")).exists():
+        if email_taken:
             raise serializers.ValidationError("Эта почта уже занята")
         return data
 
@@ -88,7 +149,7 @@ class TokenObtainWithConfirmationSerializer(serializers.Serializer):
     confirmation_code = serializers.CharField()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -101,7 +162,7 @@ class UserSerializer(serializers.ModelSerializer):
         ]
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field="username",
@@ -111,19 +172,8 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         exclude = ("title",)
 
-    def validate(self, data):
-        if self.context.get('request').method == 'POST':
-            if Review.objects.filter(
-                author_id=self.context["request"].user,
-                title=self.context["view"].kwargs.get("title_id")
-            ).exists():
-                raise serializers.ValidationError(
-                    "Вы уже оставляли отзыв на это произведение."
-                )
-        return data
-
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field="username",
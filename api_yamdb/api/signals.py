@@ -0,0 +1,91 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import forget_user_state
+from api.cache import invalidate
+from reviews.deletion import is_deleting
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+    User,
+)
+from reviews.signals import (
+    counters_recounted,
+    rows_loaded,
+    top_titles_refreshed,
+)
+
+
+# Группы закэшированных ответов, зависящие от каждой модели.
+DEPENDENT_NAMESPACES = {
+    Category: ("categories", "titles"),
+    Genre: ("genres", "titles"),
+    Title: ("titles",),
+    GenreTitle: ("titles",),
+    Review: ("titles",),
+    Comment: (),
+}
+
+
+def invalidate_cached_responses(sender, instance, **kwargs):
+    """Сбросить кэш ответов, в которых участвует изменённая модель."""
+    namespaces = list(DEPENDENT_NAMESPACES[sender])
+    if sender is Review:
+        if is_deleting(Title, instance.title_id):
+            # Ответы сбросит удаление самого произведения.
+            return
+        namespaces.append(f"reviews:{instance.title_id}")
+    elif sender is Comment:
+        if is_deleting(Review, instance.review_id):
+            # Ответы сбросит удаление самого отзыва.
+            return
+        namespaces.append(f"comments:{instance.review_id}")
+        # Ответы об отзыве содержат количество его комментариев.
+        if Comment.review.is_cached(instance):
+            title_id = instance.review.title_id
+        else:
+            title_id = (
+                Review.objects.filter(pk=instance.review_id)
+                .values_list("title_id", flat=True)
+                .first()
+            )
+        if title_id is not None:
+            namespaces.append(f"reviews:{title_id}")
+    invalidate(*namespaces)
+
+
+# Только модели из ответов API, а не каждое сохранение сессий и писем.
+for model in DEPENDENT_NAMESPACES:
+    post_save.connect(invalidate_cached_responses, sender=model)
+    post_delete.connect(invalidate_cached_responses, sender=model)
+# Жанры произведения меняются через Title.genre (модель GenreTitle).
+m2m_changed.connect(invalidate_cached_responses, sender=GenreTitle)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user_state(sender, instance, **kwargs):
+    """Сразу отозвать токены с устаревшей ролью в текущем процессе."""
+    forget_user_state(instance.pk)
+
+
+@receiver(top_titles_refreshed)
+def invalidate_top_titles(sender, **kwargs):
+    """Сбросить кэш ответов после пересчёта лучших произведений."""
+    invalidate("titles")
+
+
+@receiver(counters_recounted)
+def invalidate_recounted(sender, **kwargs):
+    """Сбросить кэш ответов о произведениях после пересчёта счётчиков."""
+    invalidate("titles")
+
+
+@receiver(rows_loaded)
+def invalidate_loaded(sender, **kwargs):
+    """Сбросить кэш ответов после загрузки строк без сигналов."""
+    invalidate(*DEPENDENT_NAMESPACES.get(sender, ()))
@@ -0,0 +1,118 @@
+from abc import ABC, abstractmethod
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(ABC, SimpleRateThrottle):
+    """Ограничение частоты по скользящему окну из двух счётчиков.
+
+    Число запросов за последний период оценивается как счётчик текущего
+    окна плюс доля счётчика предыдущего окна, ещё попадающая в период.
+    Счётчики лежат в отдельном кэше THROTTLE_CACHE_ALIAS, общем для всех
+    процессов. Атомарен incr только в Memcached и Redis: в файловом кэше
+    одновременные запросы могут потерять часть счётчика и пропустить
+    немного больше лимита.
+
+    Частота берётся из DEFAULT_THROTTLE_RATES по ключу
+    "<throttle_scope представления>_<kind>". Подклассы задают kind и
+    get_ident_value.
+    """
+
+    kind = None
+
+    def __init__(self):
+        # Частота зависит от представления и определяется в allow_request.
+        self.cache = caches[settings.THROTTLE_CACHE_ALIAS]
+
+    @abstractmethod
+    def get_ident_value(self, request):
+        """Получить значение, по которому считаются запросы.
+
+        None отключает ограничение для запроса.
+        """
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request)
+        if not ident:
+            return None
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": md5(str(ident).encode()).hexdigest(),
+        }
+
+    def allow_request(self, request, view):
+        self.scope = f"{getattr(view, 'throttle_scope', None)}_{self.kind}"
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.now = self.timer()
+        window, position = divmod(self.now, self.duration)
+        self.position = position / self.duration
+        self.current_key = f"{self.key}:{int(window)}"
+        counts = self.cache.get_many(
+            (f"{self.key}:{int(window) - 1}", self.current_key)
+        )
+        self.previous = counts.get(f"{self.key}:{int(window) - 1}", 0)
+        self.current = counts.get(self.current_key, 0)
+        # Запрос разрешён, если с ним оценка не превысит лимит.
+        if (
+            self.previous * (1 - self.position) + self.current + 1
+            > self.num_requests
+        ):
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        # Счётчик живёт, пока нужен как текущее и как предыдущее окно.
+        self.cache.add(self.current_key, 0, 2 * self.duration)
+        try:
+            self.cache.incr(self.current_key)
+        except ValueError:
+            self.cache.set(self.current_key, 1, 2 * self.duration)
+        return True
+
+    def wait(self):
+        """Получить число секунд до первого разрешённого запроса."""
+        free = self.num_requests - 1
+        if self.current <= free:
+            # Хватит того, что предыдущее окно уйдёт из периода.
+            position = 1 - (free - self.current) / self.previous
+        else:
+            # Текущее окно должно стать предыдущим и частично уйти.
+            position = 2 - free / self.current
+        return max(position - self.position, 0) * self.duration
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    """Ограничение частоты запросов с одного IP-адреса."""
+
+    kind = "ip"
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class UsernameRateThrottle(SlidingWindowThrottle):
+    """Ограничение частоты запросов от имени одного пользователя.
+
+    Для анонимных запросов имя берётся из тела запроса.
+    """
+
+    kind = "username"
+
+    def get_ident_value(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.username.lower()
+        data = request.data
+        username = data.get("username") if isinstance(data, dict) else None
+        if isinstance(username, str):
+            return username.lower()
+        return None
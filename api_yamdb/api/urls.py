@@ -1,6 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from api.async_views import as_async_reads
 from api.views import (
     CategoriesViewSet,
     CommentViewSet,
@@ -37,11 +38,18 @@ urls_v1_auth = [
     ),
 ]
 
-urls_v1 = [
-    path("", include(router_v1.urls)),
-    path("auth/", include(urls_v1_auth)),
-]
+
+def get_urls_v1(async_reads=False):
+    """Получить маршруты v1, при async_reads — с асинхронным чтением."""
+    routes = router_v1.urls
+    if async_reads:
+        routes = as_async_reads(routes)
+    return [
+        path("", include(routes)),
+        path("auth/", include(urls_v1_auth)),
+    ]
+
 
 urlpatterns = [
-    path("v1/", include(urls_v1)),
+    path("v1/", include(get_urls_v1())),
 ]
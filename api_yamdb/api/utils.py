@@ -1,17 +1,28 @@
 from django.conf import settings
-from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
 
+from reviews.models import EmailOutbox
 
-def send_confirmation_email(email):
-    """Сгенерировать и отправить токен подтверждения."""
-    user = get_user_model().objects.get(email=email)
+
+def send_confirmation_email(user):
+    """Сгенерировать токен подтверждения и отправить или поставить в очередь.
+
+    При SEND_EMAILS_ASYNC письмо только сохраняется в EmailOutbox,
+    отправляет его команда send_emails.
+    """
+    email = user.email
     confirmation_token = default_token_generator.make_token(user)
 
     subject = "Код подтверждения"
     message = f"Ваш код подтверждения: {confirmation_token}"
 
+    if settings.SEND_EMAILS_ASYNC:
+        EmailOutbox.objects.create(
+            recipient=email, subject=subject, message=message
+        )
+        return confirmation_token
+
     from_email = settings.DEFAULT_FROM_EMAIL
     recipient_list = [email]
 
@@ -1,10 +1,12 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
+from django.db import IntegrityError
+from django.db.models import Prefetch, prefetch_related_objects
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import CreateAPIView
 from rest_framework.permissions import (
     AllowAny,
@@ -12,11 +14,24 @@ from rest_framework.permissions import (
     IsAuthenticatedOrReadOnly,
 )
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
-from api.filters import TitleFilter
-from api.mixins import GetPostDeleteViewSet
+from api.authentication import RoleAccessToken
+from api.filters import (
+    FullTextSearchFilter,
+    TitleFilter,
+    TitleOrderingFilter,
+)
+from api.mixins import (
+    CachedResponseMixin,
+    ConditionalResponseMixin,
+    GetPostDeleteViewSet,
+    ReadListMixin,
+    ReadRetrieveMixin,
+    ThrottledCreateMixin,
+)
+from api.pagination import ReviewCommentPagination, TitlePagination
 from api.permissions import (
     IsAdmin,
     IsAdminOrReadOnly,
@@ -30,10 +45,13 @@ from api.serializers import (
     SignUpSerializer,
     TitleSerializer,
     TokenObtainWithConfirmationSerializer,
+    TopTitleSerializer,
+    TopTitlesQuerySerializer,
     UserSerializer,
 )
+from api.throttling import IPRateThrottle, UsernameRateThrottle
 from api.utils import send_confirmation_email
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import Category, Genre, Review, Title, TopTitle
 
 
 User = get_user_model()
@@ -44,6 +62,7 @@ class CategoriesViewSet(GetPostDeleteViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategoriesSerializer
+    cache_namespace = "categories"
 
 
 class GenresViewSet(GetPostDeleteViewSet):
@@ -51,24 +70,76 @@ class GenresViewSet(GetPostDeleteViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenresSerializer
+    cache_namespace = "genres"
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ConditionalResponseMixin,
+    CachedResponseMixin,
+    ReadListMixin,
+    ReadRetrieveMixin,
+    viewsets.ModelViewSet,
+):
     """Обрабатывает информацию о произведениях."""
 
     serializer_class = TitleSerializer
-    filter_backends = (filters.SearchFilter, DjangoFilterBackend)
-    search_fields = ("name",)
+    cache_namespace = "titles"
+    filter_backends = (
+        FullTextSearchFilter,
+        DjangoFilterBackend,
+        TitleOrderingFilter,
+    )
     permission_classes = (IsAdminOrReadOnly,)
     filterset_class = TitleFilter
+    ordering = ("-year", "id")
+    pagination_class = TitlePagination
     http_method_names = [
         m for m in viewsets.ModelViewSet.http_method_names if m not in ["put"]
     ]
 
     def get_queryset(self):
-        """Добавить поле "rating" в queryset."""
-        return Title.objects.annotate(rating=Avg("reviews__score")).order_by(
-            "-year"
+        """Получить произведения с категорией и жанрами одним набором."""
+        return (
+            Title.objects.select_related("category")
+            .prefetch_related(Prefetch("genre", queryset=Genre.objects.all()))
+            .order_by("-year")
+        )
+
+    @action(detail=False, url_path="top")
+    def top(self, request):
+        """Получить лучшие произведения по взвешенному рейтингу."""
+        return self.read_response(self.get_top, request)
+
+    def get_top(self, request):
+        """Прочитать первые limit строк таблицы лучших произведений."""
+        params = TopTitlesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        category = params.validated_data.get("category")
+        genre = params.validated_data.get("genre")
+        scope = ""
+        if genre:
+            scope = f"genre:{genre}"
+        elif category:
+            scope = f"category:{category}"
+        entries = TopTitle.objects.filter(
+            scope=scope,
+            rating_count__gte=params.validated_data["min_reviews"],
+        )
+        if genre and category:
+            entries = entries.filter(title__category__slug=category)
+        titles = []
+        for entry in entries.select_related("title__category").order_by(
+            "-weighted_rating", "title"
+        )[: params.validated_data["limit"]]:
+            entry.title.weighted_rating = entry.weighted_rating
+            titles.append(entry.title)
+        prefetch_related_objects(
+            titles, Prefetch("genre", queryset=Genre.objects.all())
+        )
+        return Response(
+            TopTitleSerializer(
+                titles, many=True, context={"request": request}
+            ).data
         )
 
 
@@ -96,6 +167,10 @@ class UsersViewSet(viewsets.ModelViewSet):
     )
     def get_update_me(self, request):
         """Получить и обновить информацию о текущем пользователе."""
+        deferred_fields = request.user.get_deferred_fields()
+        if deferred_fields:
+            # Пользователь из токена содержит только поля из claims.
+            request.user.refresh_from_db(fields=deferred_fields)
         if request.method == "GET":
             serializer = self.get_serializer(request.user)
             return Response(data=serializer.data, status=status.HTTP_200_OK)
@@ -112,6 +187,8 @@ class TokenObtainWithConfirmationView(CreateAPIView):
 
     serializer_class = TokenObtainWithConfirmationSerializer
     permission_classes = (AllowAny,)
+    throttle_classes = (IPRateThrottle, UsernameRateThrottle)
+    throttle_scope = "token"
 
     def create(self, request, *args, **kwargs):
         """Создать токен."""
@@ -123,7 +200,7 @@ class TokenObtainWithConfirmationView(CreateAPIView):
         if default_token_generator.check_token(
             user, serializer.validated_data["confirmation_code"]
         ):
-            token = AccessToken.for_user(user)
+            token = RoleAccessToken.for_user(user)
             return Response(
                 {"token": str(token)},
                 status=status.HTTP_200_OK,
@@ -134,17 +211,38 @@ class TokenObtainWithConfirmationView(CreateAPIView):
 class SignupView(APIView):
     """Регистрирует нового пользователя."""
 
+    throttle_classes = (IPRateThrottle, UsernameRateThrottle)
+    throttle_scope = "signup"
+
     def post(self, request, *args, **kwargs):
         """Проверить и зарегистрировать нового пользователя."""
         serializer = SignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user, _ = User.objects.get_or_create(**serializer.validated_data)
+        user = serializer.user
+        if user is None:
+            try:
+                user = User.objects.create(**serializer.validated_data)
+            except IntegrityError:
+                # Имя или почту успели занять параллельным запросом.
+                raise ValidationError(
+                    {
+                        api_settings.NON_FIELD_ERRORS_KEY: [
+                            "Это имя или почта уже заняты"
+                        ]
+                    }
+                )
         # Отправить письмо с кодом.
-        send_confirmation_email(user.email)
+        send_confirmation_email(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    ThrottledCreateMixin,
+    ConditionalResponseMixin,
+    ReadListMixin,
+    ReadRetrieveMixin,
+    viewsets.ModelViewSet,
+):
     """Обрабатывает информацию об отзывах."""
 
     serializer_class = ReviewSerializer
@@ -152,25 +250,63 @@ class ReviewViewSet(viewsets.ModelViewSet):
         IsAuthenticatedOrReadOnly,
         IsAuthorModerAdminOrReadOnly,
     )
+    pagination_class = ReviewCommentPagination
+    filter_backends = (FullTextSearchFilter,)
     http_method_names = [
         m for m in viewsets.ModelViewSet.http_method_names if m not in ["put"]
     ]
 
+    def get_cache_namespace(self):
+        """Получить группу ответов об отзывах к произведению."""
+        return f"reviews:{self.kwargs.get('title_id')}"
+
     def get_title(self):
-        """Получить произведение."""
-        title = self.kwargs.get("title_id")
-        return get_object_or_404(Title, id=title)
+        """Получить произведение один раз за запрос."""
+        if not hasattr(self, "_title"):
+            self._title = get_object_or_404(
+                Title, id=self.kwargs.get("title_id")
+            )
+        return self._title
+
+    def get_validator(self):
+        """Получить счётчики оценок произведения."""
+        title = self.get_title()
+        return f"{title.rating_count}:{title.rating_sum}"
+
+    def get_stored_count(self):
+        """Получить количество отзывов из счётчика произведения."""
+        return self.get_title().rating_count
 
     def get_queryset(self):
         """Вернуть все отзывы к произведению."""
-        return self.get_title().reviews.all()
+        return self.get_title().reviews.select_related("author")
 
     def perform_create(self, serializer):
         """Добавить автора отзыва и id произведения."""
-        serializer.save(author=self.request.user, title=self.get_title())
+        title = self.get_title()
+        try:
+            serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            # Повторный отзыв отсекает ограничение unique_person, другие
+            # нарушения целостности не связаны с повтором.
+            if not title.reviews.filter(author=self.request.user).exists():
+                raise
+            raise ValidationError(
+                {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        "Вы уже оставляли отзыв на это произведение."
+                    ]
+                }
+            )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ThrottledCreateMixin,
+    ConditionalResponseMixin,
+    ReadListMixin,
+    ReadRetrieveMixin,
+    viewsets.ModelViewSet,
+):
     """Обрабатывает информацию о комментариях."""
 
     serializer_class = CommentSerializer
@@ -178,18 +314,36 @@ class CommentViewSet(viewsets.ModelViewSet):
         IsAuthenticatedOrReadOnly,
         IsAuthorModerAdminOrReadOnly,
     )
+    pagination_class = ReviewCommentPagination
     http_method_names = [
         m for m in viewsets.ModelViewSet.http_method_names if m not in ["put"]
     ]
 
+    def get_cache_namespace(self):
+        """Получить группу ответов о комментариях к отзыву."""
+        return f"comments:{self.kwargs.get('review_id')}"
+
     def get_review(self):
-        """Получить отзыв."""
-        return get_object_or_404(Review, id=self.kwargs.get("review_id"))
+        """Получить отзыв к произведению одним запросом за запрос."""
+        if not hasattr(self, "_review"):
+            self._review = get_object_or_404(
+                Review,
+                id=self.kwargs.get("review_id"),
+                title_id=self.kwargs.get("title_id"),
+            )
+        return self._review
+
+    def get_validator(self):
+        """Получить счётчик комментариев отзыва."""
+        return self.get_review().comment_count
+
+    def get_stored_count(self):
+        """Получить количество комментариев из счётчика отзыва."""
+        return self.get_review().comment_count
 
     def get_queryset(self):
         """Вернуть все комментарии к отзыву."""
-        review = self.get_review()
-        return review.comments.all()
+        return self.get_review().comments.select_related("author")
 
     def perform_create(self, serializer):
         """Добавить автора комментария и id отзыва."""
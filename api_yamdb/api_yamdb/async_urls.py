@@ -0,0 +1,10 @@
+from django.urls import include, path
+
+from api_yamdb.urls import urlpatterns as sync_urlpatterns
+
+
+# Те же маршруты, но запросы на чтение к API обслуживаются асинхронно.
+urlpatterns = [
+    path("api/", include("api.async_urls")),
+    *sync_urlpatterns,
+]
@@ -0,0 +1,38 @@
+"""Приложения для команды benchmark_servers с медленной БД.
+
+Каждый запрос к БД задерживается на DB_QUERY_DELAY секунд из окружения.
+Обычные asgi.py и wsgi.py этот модуль не импортируют.
+"""
+import os
+import time
+
+from django.db.backends.signals import connection_created
+
+from api_yamdb.asgi import application as asgi_application  # noqa: F401
+from api_yamdb.wsgi import application as wsgi_application  # noqa: F401
+
+
+DB_QUERY_DELAY = float(os.getenv("DB_QUERY_DELAY", "0"))
+
+
+def delay_queries(delay):
+    """Получить обёртку, выполняющую каждый запрос к БД с задержкой."""
+
+    def delay_query(execute, sql, params, many, context):
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+
+    return delay_query
+
+
+delay_query = delay_queries(DB_QUERY_DELAY)
+
+
+def simulate_slow_database(sender, connection, **kwargs):
+    """Замедлить запросы нового соединения с БД."""
+    if delay_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(delay_query)
+
+
+if DB_QUERY_DELAY:
+    connection_created.connect(simulate_slow_database)
@@ -45,7 +45,26 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ROOT_URLCONF = "api_yamdb.urls"
+# Измерение запросов к БД и времени ответа для каждого запроса.
+QUERY_INSTRUMENTATION = os.getenv("QUERY_INSTRUMENTATION") == "1"
+
+if QUERY_INSTRUMENTATION:
+    MIDDLEWARE.insert(0, "api.middleware.QueryInstrumentationMiddleware")
+
+# Допустимое число запросов к БД по имени представления.
+QUERY_BUDGETS = {
+    "default": 20,
+    "CategoriesViewSet": 3,
+    "GenresViewSet": 3,
+    "TitleViewSet": 5,
+    "ReviewViewSet": 6,
+    "CommentViewSet": 6,
+}
+
+# Асинхронная обработка запросов на чтение под ASGI (api.async_views).
+ASYNC_READS = os.getenv("ASYNC_READS") == "1"
+
+ROOT_URLCONF = "api_yamdb.async_urls" if ASYNC_READS else "api_yamdb.urls"
 
 TEMPLATES_DIR = BASE_DIR / "templates"
 TEMPLATES = [
@@ -77,6 +96,68 @@ DATABASES = {
 }
 
 
+# Cache
+# Версии кэша также служат ETag ответов, поэтому кэш должен быть общим для
+# всех процессов сервера: по умолчанию файловый, для нескольких машин -
+# Redis или Memcached. locmem у каждого процесса свой, и изменения в одном
+# процессе не сбрасывают кэш остальных.
+# Каждая запись в файловый кэш перечисляет файлы папки, а сверх
+# MAX_ENTRIES удаляет 1/CULL_FREQUENCY случайных записей. По умолчанию
+# (300) вытеснялись бы версии групп и ответы, поэтому лимит выше.
+
+CACHE_BACKEND = os.getenv(
+    "CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+)
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.getenv("CACHE_LOCATION", str(BASE_DIR / ".cache")),
+    }
+}
+
+# Клиенты Memcached и Redis не принимают эти параметры.
+if CACHE_BACKEND.endswith(("FileBasedCache", "LocMemCache")):
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "10000")),
+        "CULL_FREQUENCY": 10,
+    }
+
+API_CACHE_ALIAS = "default"
+
+# Счётчики ограничений частоты хранятся отдельно: вытеснение ответов и
+# версий не сбрасывает окна клиентов, а поток новых имён не вытесняет
+# ответы. incr атомарен только в Memcached и Redis, в файловом кэше и
+# locmem это чтение и запись, и одновременные запросы могут потерять
+# часть счётчика, поэтому в продакшене сюда нужен Memcached.
+THROTTLE_CACHE_BACKEND = os.getenv(
+    "THROTTLE_CACHE_BACKEND",
+    "django.core.cache.backends.filebased.FileBasedCache",
+)
+
+CACHES["throttle"] = {
+    "BACKEND": THROTTLE_CACHE_BACKEND,
+    # Вложенную папку файловый кэш ответов не перечисляет и не очищает.
+    "LOCATION": os.getenv(
+        "THROTTLE_CACHE_LOCATION", str(BASE_DIR / ".cache" / "throttle")
+    ),
+}
+
+if THROTTLE_CACHE_BACKEND.endswith(("FileBasedCache", "LocMemCache")):
+    CACHES["throttle"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.getenv("THROTTLE_CACHE_MAX_ENTRIES", "10000")),
+        "CULL_FREQUENCY": 10,
+    }
+
+THROTTLE_CACHE_ALIAS = "throttle"
+
+API_CACHE_TIMEOUT = 60 * 5
+
+# Версии групп ответов устаревают сами, даже если данные изменили в обход
+# сигналов.
+API_CACHE_VERSION_TIMEOUT = 60 * 10
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -95,7 +176,11 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+EMAIL_BACKEND = os.getenv(
+    "EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend"
+)
+
+EMAIL_FILE_PATH = BASE_DIR / "sent_emails"
 
 EMAIL_HOST = "smtp.mail.ru"
 
@@ -111,6 +196,16 @@ EMAIL_HOST_PASSWORD = os.getenv("PASSWORD")
 
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Письма сохраняются в EmailOutbox и отправляются командой send_emails.
+SEND_EMAILS_ASYNC = os.getenv("SEND_EMAILS_ASYNC", "1") == "1"
+
+EMAIL_OUTBOX_BATCH_SIZE = 100
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+# Задержка перед повторной отправкой: база * 2 ** (попытка - 1) секунд.
+EMAIL_OUTBOX_RETRY_DELAY = 30
+
 
 # Internationalization
 
@@ -133,12 +228,48 @@ STATICFILES_DIRS = ((BASE_DIR / "static/"),)
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Лучшие произведения: вес средней оценки по всем произведениям
+# в байесовском рейтинге и пауза между пересчётами таблицы.
+TOP_TITLES_PRIOR_WEIGHT = 5
+TOP_TITLES_REFRESH_INTERVAL = 60 * 5
+TOP_TITLES_MAX_LIMIT = 100
+
+JWT_STATELESS = os.getenv("JWT_STATELESS") == "1"
+# Сколько секунд процесс доверяет роли пользователя без проверки в БД.
+JWT_ROLE_CACHE_TIMEOUT = 30
+JWT_ROLE_CACHE_SIZE = 10000
+
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.CachedCountPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Без загрузки пользователя из БД на каждый запрос.
+        "api.authentication.StatelessJWTAuthentication"
+        if JWT_STATELESS
+        else "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
+    # Частоты для api.throttling: "<throttle_scope>_ip" и
+    # "<throttle_scope>_username".
+    "DEFAULT_THROTTLE_RATES": {
+        "signup_ip": os.getenv("THROTTLE_SIGNUP_IP", "20/hour"),
+        "signup_username": os.getenv("THROTTLE_SIGNUP_USERNAME", "5/hour"),
+        "token_ip": os.getenv("THROTTLE_TOKEN_IP", "60/hour"),
+        "token_username": os.getenv("THROTTLE_TOKEN_USERNAME", "10/hour"),
+        "write_ip": os.getenv("THROTTLE_WRITE_IP", "120/min"),
+        "write_username": os.getenv("THROTTLE_WRITE_USERNAME", "30/min"),
+    },
+}
+
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api.middleware": {"handlers": ["console"], "level": "INFO"},
+    },
 }
 
 
@@ -1,7 +1,24 @@
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.paginator import Paginator
+from django.db import OperationalError, connection
+from django.db.models import Prefetch, Q
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html
 
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+    User,
+)
+from reviews.search import get_search_backend
 
 
 @admin.register(User)
@@ -14,6 +31,12 @@ class UserAdmin(BaseUserAdmin):
     BaseUserAdmin.fieldsets += (("Extra Fields", {"fields": ("bio", "role")}),)
 
 
+class GenreTitleInline(admin.TabularInline):
+    model = GenreTitle
+    autocomplete_fields = ("genre",)
+    extra = 0
+
+
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
     list_display = (
@@ -25,6 +48,19 @@ class TitleAdmin(admin.ModelAdmin):
     search_fields = ("name",)
     list_filter = ("category",)
     list_display_links = ("name",)
+    list_select_related = ("category",)
+    autocomplete_fields = ("category",)
+    inlines = (GenreTitleInline,)
+
+    def get_queryset(self, request):
+        """Загрузить жанры всех произведений страницы одним запросом."""
+        return (
+            super()
+            .get_queryset(request)
+            .prefetch_related(
+                Prefetch("genre", queryset=Genre.objects.only("name"))
+            )
+        )
 
     @admin.display(
         description="Жанры",
@@ -33,8 +69,25 @@ class TitleAdmin(admin.ModelAdmin):
         return ",".join([genre.name for genre in obj.genre.all()])
 
 
-class OrderItemTabular(admin.TabularInline):
+class LimitedInlineFormSet(BaseInlineFormSet):
+    """Показывает только первые max_objects связанных объектов."""
+
+    max_objects = 20
+
+    def get_queryset(self):
+        if not hasattr(self, "_limited_queryset"):
+            self._limited_queryset = super().get_queryset()[
+                : self.max_objects
+            ]
+        return self._limited_queryset
+
+
+class CategoryTitleInline(admin.TabularInline):
     model = Title
+    formset = LimitedInlineFormSet
+    fields = ("name", "year")
+    extra = 0
+    show_change_link = True
 
 
 @admin.register(Category)
@@ -47,10 +100,26 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ("name",)
     list_display_links = ("name",)
     ordering = ("-id",)
+    readonly_fields = ("_titles",)
     inlines = [
-        OrderItemTabular,
+        CategoryTitleInline,
     ]
 
+    @admin.display(
+        description="Произведения",
+    )
+    def _titles(self, obj):
+        """Ссылка на постраничный список всех произведений категории."""
+        if obj.pk is None:
+            return "-"
+        url = reverse("admin:reviews_title_changelist")
+        return format_html(
+            '<a href="{}?category__id__exact={}">Все произведения ({})</a>',
+            url,
+            obj.pk,
+            obj.titles.count(),
+        )
+
 
 @admin.register(Genre)
 class GenreAdmin(admin.ModelAdmin):
@@ -63,8 +132,153 @@ class GenreAdmin(admin.ModelAdmin):
     list_display_links = ("name",)
 
 
+def estimate_count(model):
+    """Получить примерное число строк таблицы из статистики БД.
+
+    Возвращает None, если статистики нет.
+    """
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE relname = %s", (table,)
+            )
+        elif connection.vendor == "sqlite":
+            try:
+                # Первое число stat - количество строк, собранное ANALYZE.
+                cursor.execute(
+                    "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1",
+                    (table,),
+                )
+            except OperationalError:
+                return None
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    estimate = int(float(str(row[0]).split()[0]))
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Берёт размер большой таблицы без фильтров из статистики БД.
+
+    COUNT(*) по всей таблице читает её целиком, а для списка в админке
+    точное число страниц не нужно.
+    """
+
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        if not self.object_list.query.where:
+            estimate = estimate_count(self.object_list.model)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+        return super().count
+
+
+class AuthorFilter(admin.ListFilter):
+    """Фильтр по автору с поиском вместо списка всех пользователей."""
+
+    title = "автору"
+    parameter_name = "author__id__exact"
+    template = "admin/autocomplete_filter.html"
+
+    def __init__(self, request, params, model, model_admin):
+        super().__init__(request, params, model, model_admin)
+        self.value = params.pop(self.parameter_name, None)
+        field = model._meta.get_field("author")
+        widget = AutocompleteSelect(
+            field, model_admin.admin_site, attrs={"style": "width: 100%"}
+        )
+        widget.choices = field.formfield().choices
+        self.rendered_widget = widget.render(self.parameter_name, self.value)
+
+    def has_output(self):
+        return True
+
+    def expected_parameters(self):
+        return [self.parameter_name]
+
+    def queryset(self, request, queryset):
+        if self.value:
+            return queryset.filter(author_id=self.value)
+        return queryset
+
+    def choices(self, changelist):
+        # Остальные параметры списка передаются вместе с формой фильтра.
+        self.hidden_params = [
+            (name, value)
+            for name, value in changelist.params.items()
+            if name not in (self.parameter_name, "p")
+        ]
+        yield {
+            "selected": self.value is None,
+            "query_string": changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+            "display": "Все",
+        }
+
+
+class ScoreRangeFilter(admin.SimpleListFilter):
+    title = "оценке"
+    parameter_name = "score_range"
+    ranges = {
+        "1-4": ("Низкая (1-4)", 1, 4),
+        "5-7": ("Средняя (5-7)", 5, 7),
+        "8-10": ("Высокая (8-10)", 8, 10),
+    }
+
+    def lookups(self, request, model_admin):
+        return [(key, label) for key, (label, _, _) in self.ranges.items()]
+
+    def queryset(self, request, queryset):
+        if self.value() in self.ranges:
+            _, low, high = self.ranges[self.value()]
+            return queryset.filter(score__range=(low, high))
+        return queryset
+
+
+class ReviewCommentAdmin(admin.ModelAdmin):
+    """Общие настройки больших списков отзывов и комментариев."""
+
+    search_fields = ("text",)
+    list_filter = (AuthorFilter,)
+    list_select_related = ("author",)
+    autocomplete_fields = ("author",)
+    date_hierarchy = "pub_date"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @property
+    def media(self):
+        # Скрипты поля поиска автора в фильтре.
+        return super().media + AutocompleteSelect(
+            self.model._meta.get_field("author"), self.admin_site
+        ).media
+
+    def get_search_results(self, request, queryset, search_term):
+        """Искать по тексту через поисковый индекс или по имени автора."""
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        found = get_search_backend().search(
+            self.model.objects.all(), search_term
+        )
+        return (
+            queryset.filter(
+                Q(pk__in=found.values("pk"))
+                | Q(author__username=search_term)
+            ),
+            False,
+        )
+
+
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(ReviewCommentAdmin):
     list_display = (
         "id",
         "text",
@@ -73,17 +287,16 @@ class ReviewAdmin(admin.ModelAdmin):
         "pub_date",
         "title_id",
     )
-    search_fields = ("text", "author")
-    list_filter = ("author",)
+    list_filter = ReviewCommentAdmin.list_filter + (ScoreRangeFilter,)
+    autocomplete_fields = ("author", "title")
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(ReviewCommentAdmin):
     list_display = (
         "id",
         "text",
         "author",
         "pub_date",
     )
-    search_fields = ("text", "author")
-    list_filter = ("author",)
+    raw_id_fields = ("review",)
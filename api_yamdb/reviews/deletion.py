@@ -0,0 +1,32 @@
+import threading
+from contextlib import contextmanager
+
+
+# Объекты, которые удаляются в текущем потоке вместе со связанными.
+state = threading.local()
+
+
+@contextmanager
+def deletion_scope():
+    """Отмечать удаляемые объекты до конца удаления, даже неудачного."""
+    if getattr(state, "objects", None) is not None:
+        # Вложенное удаление входит во внешнее.
+        yield
+        return
+    state.objects = set()
+    try:
+        yield
+    finally:
+        state.objects = None
+
+
+def mark_deleting(instance):
+    """Отметить объект как удаляемый внутри deletion_scope."""
+    if getattr(state, "objects", None) is not None:
+        state.objects.add((type(instance), instance.pk))
+
+
+def is_deleting(model, pk):
+    """Проверить, удаляется ли объект в текущем deletion_scope."""
+    objects = getattr(state, "objects", None)
+    return objects is not None and (model, pk) in objects
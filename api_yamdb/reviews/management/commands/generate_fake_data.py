@@ -0,0 +1,221 @@
+import csv
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+
+from reviews.management.commands.import_csv import TABLES
+from reviews.numbers import MAX_SCORE, MIN_SCORE
+
+
+WORDS = (
+    "тайна", "дорога", "город", "ночь", "море", "звезда", "война", "мир",
+    "любовь", "время", "песня", "огонь", "тень", "остров", "сердце", "зима",
+    "лето", "ветер", "камень", "река", "сон", "память", "свет", "герой",
+)
+# Колонки csv файлов в том виде, в котором их читает import_csv.
+HEADERS = {
+    "users": (
+        "id", "username", "email", "role", "bio", "first_name", "last_name"
+    ),
+    "category": ("id", "name", "slug"),
+    "genre": ("id", "name", "slug"),
+    "titles": ("id", "name", "year", "category"),
+    "genre_title": ("id", "title_id", "genre_id"),
+    "review": ("id", "title_id", "text", "author", "score", "pub_date"),
+    "comments": ("id", "review_id", "text", "author", "pub_date"),
+}
+FIRST_YEAR = 1900
+# Даты считаются от фиксированного момента, чтобы --seed давал те же данные.
+LAST_PUB_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+PUB_DATE_DAYS = 365 * 5
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерирует тестовые данные заданного объёма и загружает их в БД "
+        "или сохраняет в csv файлы для import_csv."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--categories", type=int, default=10)
+        parser.add_argument("--genres", type=int, default=30)
+        parser.add_argument("--titles", type=int, default=1000)
+        parser.add_argument("--genres-per-title", type=int, default=2)
+        parser.add_argument(
+            "--max-reviews-per-title",
+            type=int,
+            default=500,
+            help="Число отзывов на самое популярное произведение.",
+        )
+        parser.add_argument(
+            "--zipf-exponent",
+            type=float,
+            default=1.0,
+            help="Произведение с рангом k получает max / k^s отзывов.",
+        )
+        parser.add_argument(
+            "--comments-per-review",
+            type=float,
+            default=1.0,
+            help="Среднее число комментариев к отзыву.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output-dir",
+            help="Сохранить csv файлы в папку вместо загрузки в БД.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Сгенерировать данные и сохранить их в csv или в БД."""
+        if options["genres_per_title"] > options["genres"]:
+            raise CommandError("--genres-per-title больше числа жанров.")
+        if min(options["users"], options["categories"]) < 1:
+            raise CommandError("Нужен хотя бы один пользователь и категория.")
+        self.random = random.Random(options["seed"])
+        if options["output_dir"]:
+            os.makedirs(options["output_dir"], exist_ok=True)
+            self.write_tables(options["output_dir"], options, offsets={})
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Данные сохранены в {options['output_dir']}"
+                )
+            )
+            return
+        # Новые id идут после уже существующих, чтобы не было конфликтов.
+        offsets = {
+            name: model.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+            for name, (model, _, _) in TABLES.items()
+        }
+        with tempfile.TemporaryDirectory() as data_dir:
+            self.write_tables(data_dir, options, offsets)
+            call_command(
+                "import_csv",
+                data_dir=data_dir,
+                batch_size=options["batch_size"],
+                stdout=self.stdout,
+            )
+
+    def write_tables(self, data_dir, options, offsets):
+        """Записать все таблицы в csv файлы папки data_dir."""
+        self.offsets = offsets
+        self.data_dir = data_dir
+        users = self.write("users", self.generate_users(options["users"]))
+        categories = self.write(
+            "category",
+            self.generate_groups("category", options["categories"]),
+        )
+        genres = self.write(
+            "genre", self.generate_groups("genre", options["genres"])
+        )
+        titles = self.write(
+            "titles", self.generate_titles(options["titles"], categories)
+        )
+        self.write(
+            "genre_title",
+            self.generate_genre_titles(
+                titles, genres, options["genres_per_title"]
+            ),
+        )
+        reviews = self.write(
+            "review",
+            self.generate_reviews(
+                titles,
+                users,
+                options["max_reviews_per_title"],
+                options["zipf_exponent"],
+            ),
+        )
+        self.write(
+            "comments",
+            self.generate_comments(
+                reviews, users, options["comments_per_review"]
+            ),
+        )
+
+    def write(self, name, rows):
+        """Записать строки таблицы в csv файл и вернуть их id."""
+        ids = []
+        csv_path = os.path.join(self.data_dir, TABLES[name][1])
+        with open(csv_path, "w", encoding="utf-8", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(HEADERS[name])
+            for number, row in enumerate(rows, self.first_id(name)):
+                writer.writerow((number, *row))
+                ids.append(number)
+        self.stdout.write(f"{name}: {len(ids)}")
+        return ids
+
+    def first_id(self, name):
+        """Получить id первой генерируемой строки таблицы."""
+        return self.offsets.get(name, 0) + 1
+
+    def text(self, words):
+        return " ".join(self.random.choices(WORDS, k=words)).capitalize()
+
+    def pub_date(self):
+        moment = LAST_PUB_DATE - timedelta(
+            seconds=self.random.randint(0, PUB_DATE_DAYS * 24 * 60 * 60)
+        )
+        return moment.isoformat()
+
+    def generate_users(self, count):
+        start = self.first_id("users")
+        for user_id in range(start, start + count):
+            yield (
+                f"user{user_id}",
+                f"user{user_id}@yamdb.fake",
+                "user",
+                "",
+                "",
+                "",
+            )
+
+    def generate_groups(self, name, count):
+        start = self.first_id(name)
+        for group_id in range(start, start + count):
+            yield (f"{self.text(1)} {group_id}", f"{name}-{group_id}")
+
+    def generate_titles(self, count, categories):
+        for _ in range(count):
+            yield (
+                self.text(2),
+                self.random.randint(FIRST_YEAR, LAST_PUB_DATE.year),
+                self.random.choice(categories),
+            )
+
+    def generate_genre_titles(self, titles, genres, per_title):
+        for title_id in titles:
+            for genre_id in self.random.sample(genres, per_title):
+                yield (title_id, genre_id)
+
+    def generate_reviews(self, titles, users, max_reviews, exponent):
+        # Ранг популярности не совпадает с порядком id произведений.
+        ranked = self.random.sample(titles, len(titles))
+        for rank, title_id in enumerate(ranked, 1):
+            count = min(len(users), int(max_reviews / rank ** exponent))
+            # Один пользователь пишет не больше одного отзыва на произведение.
+            for author_id in self.random.sample(users, count):
+                yield (
+                    title_id,
+                    self.text(12),
+                    author_id,
+                    self.random.randint(MIN_SCORE, MAX_SCORE),
+                    self.pub_date(),
+                )
+
+    def generate_comments(self, reviews, users, per_review):
+        for review_id in reviews:
+            for _ in range(round(self.random.uniform(0, 2 * per_review))):
+                yield (
+                    review_id,
+                    self.text(6),
+                    self.random.choice(users),
+                    self.pub_date(),
+                )
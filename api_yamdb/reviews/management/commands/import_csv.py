@@ -1,10 +1,22 @@
 import csv
 import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from django.shortcuts import get_object_or_404
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
 
+from reviews.management.commands.recount import (
+    recount_comments,
+    recount_ratings,
+)
+from reviews.management.commands.refresh_top_titles import (
+    refresh_top_titles,
+)
 from reviews.models import (
     Category,
     Comment,
@@ -14,93 +26,201 @@ from reviews.models import (
     Title,
     User,
 )
+from reviews.signals import counters_recounted, rows_loaded
+
+
+DEFAULT_DATA_DIR = os.path.join(
+    settings.BASE_DIR, "reviews/management/commands/data"
+)
+DEFAULT_BATCH_SIZE = 1000
+
+# Таблицы в порядке загрузки: модель, файл и переименование колонок.
+TABLES = {
+    "users": (User, "users.csv", {}),
+    "category": (Category, "category.csv", {}),
+    "genre": (Genre, "genre.csv", {}),
+    "titles": (Title, "titles.csv", {"category": "category_id"}),
+    "genre_title": (GenreTitle, "genre_title.csv", {}),
+    "review": (Review, "review.csv", {"author": "author_id"}),
+    "comments": (Comment, "comments.csv", {"author": "author_id"}),
+}
+# Таблицы, которые можно загружать только после загрузки родительских.
+DEPENDENCIES = {
+    "titles": ("category",),
+    "genre_title": ("titles", "genre"),
+    "review": ("titles", "users"),
+    "comments": ("review", "users"),
+}
+
+
+def read_rows(csv_path):
+    """Построчно прочитать csv файл, закрыв его после чтения."""
+    with open(csv_path, "r", encoding="utf-8") as csv_file:
+        yield from csv.DictReader(csv_file, delimiter=",")
 
 
-def find_data(csv_file):
-    """Найти и открыть нужный файл csv."""
-    csv_path = os.path.join(
-        settings.BASE_DIR, "reviews/management/commands/data", csv_file
-    )
-    return csv.reader(open(csv_path, "r", encoding="utf-8"), delimiter=",")
+def read_chunks(rows, size):
+    """Разбить поток строк на части заданного размера."""
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
 
 
 class Command(BaseCommand):
     help = "Импортирует данные из csv файлов."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--data-dir",
+            default=DEFAULT_DATA_DIR,
+            help="Папка с csv файлами.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Количество строк в одной вставке.",
+        )
+        parser.add_argument(
+            "--only",
+            action="append",
+            choices=TABLES,
+            help="Загрузить только указанную таблицу (можно повторять).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Количество таблиц, загружаемых одновременно.",
+        )
+
     def handle(self, *args, **options):
         """Загрузить данные в БД."""
-        # Загрузить пользователей в БД.
-        reader = find_data("users.csv")
-        next(reader, None)
-        for row in reader:
-            data, status = User.objects.get_or_create(
-                id=row[0],
-                username=row[1],
-                email=row[2],
-                role=row[3],
-                bio=row[4],
-                first_name=row[5],
-                last_name=row[6],
-            )
-
-        # Загрузить категории в БД.
-        reader = find_data("category.csv")
-        next(reader, None)  # Пропускает первую строку
-        for row in reader:
-            data, status = Category.objects.get_or_create(
-                id=row[0], name=row[1], slug=row[2]
-            )
-
-        # Загрузить жанры в БД.
-        reader = find_data("genre.csv")
-        next(reader, None)
-        for row in reader:
-            data, status = Genre.objects.get_or_create(
-                id=row[0], name=row[1], slug=row[2]
-            )
-
-        # Загрузить произведения в БД.
-        reader = find_data("titles.csv")
-        next(reader, None)
-        for row in reader:
-            data, status = Title.objects.get_or_create(
-                id=row[0],
-                name=row[1],
-                year=row[2],
-                category=get_object_or_404(Category, id=row[3]),
-            )
-
-        # Загрузить служебную таблицу в БД.
-        reader = find_data("genre_title.csv")
-        next(reader, None)
-        for row in reader:
-            obj, created = GenreTitle.objects.get_or_create(
-                id=row[0], title_id=row[1], genre_id=row[2]
-            )
-
-        # Загрузить отзывы в БД.
-        reader = find_data("review.csv")
-        next(reader, None)
-        for row in reader:
-            data, status = Review.objects.get_or_create(
-                id=row[0],
-                title=get_object_or_404(Title, id=row[1]),
-                text=row[2],
-                author=get_object_or_404(User, id=row[3]),
-                score=row[4],
-                pub_date=row[5],
-            )
-
-        # Загрузить комментарии в БД.
-        reader = find_data("comments.csv")
-        next(reader, None)
-        for row in reader:
-            data, status = Comment.objects.get_or_create(
-                id=row[0],
-                review=get_object_or_404(Review, id=row[1]),
-                text=row[2],
-                author=get_object_or_404(User, id=row[3]),
-                pub_date=row[4],
-            )
-
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size должен быть больше нуля.")
+        if options["workers"] < 1:
+            raise CommandError("--workers должен быть больше нуля.")
+        # Множества id уже загруженных объектов для проверки внешних ключей.
+        self.known_ids = {}
+        self.known_ids_lock = threading.Lock()
+        names = [
+            name for name in TABLES if name in (options["only"] or TABLES)
+        ]
+        self.load_tables(
+            names,
+            options["workers"],
+            options["data_dir"],
+            options["batch_size"],
+        )
+        if "review" in names:
+            recount_ratings()
+            refresh_top_titles(options["batch_size"])
+        if {"review", "comments"} & set(names):
+            recount_comments()
+            counters_recounted.send(sender=Title)
+        for name in names:
+            rows_loaded.send(sender=TABLES[name][0])
         self.stdout.write(self.style.SUCCESS("Данные загружены!"))
+
+    def load_tables(self, names, workers, *args):
+        """Загрузить таблицы параллельно, соблюдая зависимости между ними."""
+        pending = list(names)
+        done = set()
+        running = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while pending or running:
+                for name in list(pending):
+                    parents = [
+                        parent
+                        for parent in DEPENDENCIES.get(name, ())
+                        if parent in names
+                    ]
+                    if all(parent in done for parent in parents):
+                        pending.remove(name)
+                        running[
+                            executor.submit(self.run_worker, name, *args)
+                        ] = name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    # Ошибка загрузки прерывает импорт оставшихся таблиц.
+                    future.result()
+                    done.add(running.pop(future))
+
+    def run_worker(self, name, *args):
+        """Загрузить таблицу в отдельном потоке со своим подключением к БД."""
+        try:
+            self.load_table(name, *args)
+        finally:
+            connection.close()
+
+    def get_known_ids(self, model):
+        """Получить множество id объектов модели, уже сохранённых в БД."""
+        with self.known_ids_lock:
+            if model not in self.known_ids:
+                self.known_ids[model] = set(
+                    model.objects.values_list("id", flat=True)
+                )
+            return self.known_ids[model]
+
+    def build_object(self, model, row, foreign_keys):
+        """Создать объект модели или вернуть None при битой ссылке."""
+        for attname, field in foreign_keys.items():
+            value = row.get(attname)
+            if not value:
+                if not field.null:
+                    return None
+                row[attname] = None
+                continue
+            row[attname] = int(value)
+            if row[attname] not in self.get_known_ids(field.related_model):
+                return None
+        return model(**row)
+
+    def load_table(self, name, data_dir, batch_size):
+        """Загрузить одну таблицу пачками, каждую в своей транзакции."""
+        model, csv_file, renames = TABLES[name]
+        foreign_keys = {
+            field.attname: field
+            for field in model._meta.concrete_fields
+            if field.is_relation
+        }
+        rows = (
+            {renames.get(key, key): value for key, value in row.items()}
+            for row in read_rows(os.path.join(data_dir, csv_file))
+        )
+        processed = skipped = 0
+        # ignore_conflicts не сообщает, какие строки вставлены.
+        existing = model.objects.count()
+        started = time.monotonic()
+        for chunk in read_chunks(rows, batch_size):
+            objects = []
+            for row in chunk:
+                obj = self.build_object(model, row, foreign_keys)
+                if obj is None:
+                    skipped += 1
+                else:
+                    objects.append(obj)
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    objects, batch_size=batch_size, ignore_conflicts=True
+                )
+            processed += len(chunk)
+        self.reset_sequence(model)
+        with self.known_ids_lock:
+            self.known_ids.pop(model, None)
+        elapsed = time.monotonic() - started
+        inserted = model.objects.count() - existing
+        self.stdout.write(
+            f"{name}: обработано {processed} строк за {elapsed:.2f} с "
+            f"({processed / elapsed if elapsed else processed:.0f} строк/с), "
+            f"вставлено {inserted}, пропущено {skipped}"
+        )
+
+    def reset_sequence(self, model):
+        """Сдвинуть счётчик id после вставки строк с явными id."""
+        statements = connection.ops.sequence_reset_sql(no_style(), [model])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.search import SEARCH_FIELDS, get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Перестраивает поисковый индекс произведений и отзывов."
+
+    def handle(self, *args, **options):
+        """Перестроить индекс всех моделей."""
+        backend = get_search_backend()
+        with transaction.atomic():
+            for model in SEARCH_FIELDS:
+                backend.rebuild(model)
+        self.stdout.write(self.style.SUCCESS("Поисковый индекс перестроен!"))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from reviews.models import Comment, Review, Title, get_rating_avg
+from reviews.signals import counters_recounted
+
+
+def recount_ratings():
+    """Пересчитать сумму, количество и среднее оценок произведений."""
+    reviews = (
+        Review.objects.filter(title=OuterRef("pk")).order_by().values("title")
+    )
+    rating_sum = Coalesce(
+        Subquery(reviews.annotate(total=Sum("score")).values("total")), 0
+    )
+    rating_count = Coalesce(
+        Subquery(reviews.annotate(total=Count("id")).values("total")), 0
+    )
+    return Title.objects.update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating_avg=get_rating_avg(rating_sum, rating_count),
+    )
+
+
+def recount_comments():
+    """Пересчитать количество комментариев всех отзывов."""
+    return Review.objects.update(
+        comment_count=Coalesce(
+            Subquery(
+                Comment.objects.filter(review=OuterRef("pk"))
+                .order_by()
+                .values("review")
+                .annotate(total=Count("id"))
+                .values("total")
+            ),
+            0,
+        )
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает сохранённые рейтинги произведений и количество "
+        "комментариев отзывов."
+    )
+
+    def handle(self, *args, **options):
+        """Пересчитать рейтинги и счётчики с нуля."""
+        with transaction.atomic():
+            updated = recount_ratings()
+            reviews = recount_comments()
+        counters_recounted.send(sender=Title)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Рейтинги пересчитаны: {updated}, отзывы: {reviews}"
+            )
+        )
@@ -0,0 +1,113 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Sum
+
+from reviews.models import GenreTitle, Title, TopTitle
+from reviews.signals import top_titles_refreshed
+
+
+def get_weighted_rating(rating_sum, rating_count, mean, weight):
+    """Получить байесовскую оценку произведения.
+
+    Средняя оценка произведения сдвигается к средней оценке по всем
+    произведениям, как будто у него есть ещё weight таких оценок.
+    """
+    return (rating_sum + weight * mean) / (rating_count + weight)
+
+
+def refresh_top_titles(batch_size=1000):
+    """Пересобрать таблицу лучших произведений с нуля."""
+    totals = Title.objects.aggregate(
+        rating_sum=Sum("rating_sum"), rating_count=Sum("rating_count")
+    )
+    mean = (
+        totals["rating_sum"] / totals["rating_count"]
+        if totals["rating_count"]
+        else 0
+    )
+    entries = {}
+    for title_id, rating_sum, rating_count, category in (
+        Title.objects.filter(rating_count__gt=0)
+        .values_list("id", "rating_sum", "rating_count", "category__slug")
+        .iterator()
+    ):
+        entries[title_id] = (
+            get_weighted_rating(
+                rating_sum,
+                rating_count,
+                mean,
+                settings.TOP_TITLES_PRIOR_WEIGHT,
+            ),
+            rating_count,
+            category,
+        )
+
+    def build():
+        for title_id, (rating, rating_count, category) in entries.items():
+            scopes = [""]
+            if category:
+                scopes.append(f"category:{category}")
+            for scope in scopes:
+                yield TopTitle(
+                    scope=scope,
+                    title_id=title_id,
+                    weighted_rating=rating,
+                    rating_count=rating_count,
+                )
+        for title_id, genre in (
+            GenreTitle.objects.filter(title__rating_count__gt=0)
+            .values_list("title_id", "genre__slug")
+            .iterator()
+        ):
+            if title_id not in entries:
+                # Произведение получило первую оценку во время пересчёта.
+                continue
+            rating, rating_count, _ = entries[title_id]
+            yield TopTitle(
+                scope=f"genre:{genre}",
+                title_id=title_id,
+                weighted_rating=rating,
+                rating_count=rating_count,
+            )
+
+    with transaction.atomic():
+        # Удаление через ORM загрузило бы все строки ради сигналов.
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TopTitle._meta.db_table}")
+        objects = TopTitle.objects.bulk_create(build(), batch_size=batch_size)
+    top_titles_refreshed.send(sender=TopTitle)
+    return len(objects)
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает таблицу лучших произведений."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Работать постоянно, пересчитывая таблицу с интервалом.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.TOP_TITLES_REFRESH_INTERVAL,
+            help="Пауза в секундах между пересчётами.",
+        )
+
+    def handle(self, *args, **options):
+        """Пересчитать таблицу один раз или периодически."""
+        while True:
+            started = time.monotonic()
+            count = refresh_top_titles()
+            self.stdout.write(
+                f"Строк в рейтинге: {count}, "
+                f"{time.monotonic() - started:.2f} с"
+            )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS("Рейтинг обновлён!"))
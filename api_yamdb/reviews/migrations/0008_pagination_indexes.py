@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-18 20:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0007_title_rating"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["-pub_date", "id"], name="comment_pub_date_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["-pub_date", "id"], name="review_pub_date_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["-year", "id"], name="title_year_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+
+
+# Таблица и поле, по которому строится поисковый индекс.
+SEARCH_FIELDS = (
+    ("reviews_title", "name"),
+    ("reviews_review", "text"),
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, field in SEARCH_FIELDS:
+        if vendor == "sqlite":
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {table}_fts USING fts5(content)"
+            )
+            schema_editor.execute(
+                f"INSERT INTO {table}_fts (rowid, content) "
+                f"SELECT id, {field} FROM {table}"
+            )
+        elif vendor == "postgresql":
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            schema_editor.execute(
+                f"CREATE INDEX {table}_{field}_tsv_idx ON {table} USING gin "
+                f"(to_tsvector('simple'::regconfig, "
+                f"COALESCE(({field})::text, '')))"
+            )
+            schema_editor.execute(
+                f"CREATE INDEX {table}_{field}_trgm_idx ON {table} "
+                f"USING gin ({field} gin_trgm_ops)"
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, field in SEARCH_FIELDS:
+        if vendor == "sqlite":
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+        elif vendor == "postgresql":
+            schema_editor.execute(
+                f"DROP INDEX IF EXISTS {table}_{field}_tsv_idx"
+            )
+            schema_editor.execute(
+                f"DROP INDEX IF EXISTS {table}_{field}_trgm_idx"
+            )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0008_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
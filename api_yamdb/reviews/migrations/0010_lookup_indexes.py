@@ -0,0 +1,64 @@
+# Generated by Django 3.2 on 2026-10-18 20:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0009_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["review", "-pub_date", "id"],
+                name="comment_review_pub_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["title", "-pub_date", "id"],
+                name="review_title_pub_date_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="genretitle",
+            constraint=models.UniqueConstraint(
+                fields=("genre", "title"), name="unique_genre_title"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="comment",
+            name="review",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="comments",
+                to="reviews.review",
+                verbose_name="Отзыв",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="genretitle",
+            name="genre",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="reviews.genre",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="review",
+            name="title",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="reviews",
+                to="reviews.title",
+                verbose_name="Произведение",
+            ),
+        ),
+    ]
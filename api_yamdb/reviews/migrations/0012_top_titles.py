@@ -0,0 +1,62 @@
+# Generated by Django 3.2 on 2026-10-18 21:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0011_email_outbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TopTitle",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "scope",
+                    models.CharField(max_length=64, verbose_name="Рейтинг"),
+                ),
+                (
+                    "weighted_rating",
+                    models.FloatField(verbose_name="Взвешенный рейтинг"),
+                ),
+                (
+                    "rating_count",
+                    models.PositiveIntegerField(
+                        verbose_name="Количество оценок"
+                    ),
+                ),
+                (
+                    "title",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="top_entries",
+                        to="reviews.title",
+                        verbose_name="Произведение",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Место в рейтинге",
+                "verbose_name_plural": "Лучшие произведения",
+                "ordering": ("scope", "-weighted_rating", "title"),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="toptitle",
+            index=models.Index(
+                fields=["scope", "-weighted_rating", "title"],
+                name="top_title_scope_rating_idx",
+            ),
+        ),
+    ]
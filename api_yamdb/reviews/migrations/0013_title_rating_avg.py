@@ -0,0 +1,48 @@
+# Generated by Django 3.2 on 2026-10-18 21:08
+
+from django.db import migrations, models
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+
+def fill_rating_avg(apps, schema_editor):
+    Title = apps.get_model("reviews", "Title")
+    Title.objects.filter(rating_count__gt=0).update(
+        rating_avg=Cast("rating_sum", FloatField()) / F("rating_count")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0012_top_titles"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="title",
+            name="rating_avg",
+            field=models.FloatField(
+                default=0, editable=False, verbose_name="Средняя оценка"
+            ),
+        ),
+        migrations.RunPython(fill_rating_avg, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["-rating_avg", "id"], name="title_rating_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["-rating_count", "id"],
+                name="title_rating_count_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["-name", "id"], name="title_name_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2 on 2026-10-18 21:13
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    Comment = apps.get_model("reviews", "Comment")
+    Review = apps.get_model("reviews", "Review")
+    Review.objects.update(
+        comment_count=Coalesce(
+            Subquery(
+                Comment.objects.filter(review=OuterRef("pk"))
+                .order_by()
+                .values("review")
+                .annotate(total=Count("id"))
+                .values("total")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0014_comment_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="comment_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                verbose_name="Количество комментариев",
+            ),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.2 on 2026-10-18 21:32
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0015_review_comment_count"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="comment",
+            name="comment_pub_date_id_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="review",
+            name="review_pub_date_id_idx",
+        ),
+    ]
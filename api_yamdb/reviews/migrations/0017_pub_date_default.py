@@ -0,0 +1,31 @@
+# Generated by Django 3.2 on 2026-10-18 21:34
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0016_drop_global_pub_date_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="comment",
+            name="pub_date",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name="Дата публикации",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="review",
+            name="pub_date",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name="Дата публикации",
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+from django.db import migrations
+
+# Таблица и поле, по которому строится поисковый индекс.
+SEARCH_FIELDS = (
+    ("reviews_title", "name"),
+    ("reviews_review", "text"),
+    ("reviews_comment", "text"),
+)
+
+
+def create_search_triggers(apps, schema_editor):
+    # Триггеры привязаны к таблице: если миграция пересоздаёт таблицу
+    # (ALTER в SQLite), их нужно создать заново.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table, field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f"CREATE TRIGGER {table}_fts_insert AFTER INSERT ON {table} "
+            f"BEGIN INSERT INTO {table}_fts (rowid, content) "
+            f"VALUES (new.id, new.{field}); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {table}_fts_update AFTER UPDATE OF {field} "
+            f"ON {table} BEGIN "
+            f"DELETE FROM {table}_fts WHERE rowid = old.id; "
+            f"INSERT INTO {table}_fts (rowid, content) "
+            f"VALUES (new.id, new.{field}); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {table}_fts_delete AFTER DELETE ON {table} "
+            f"BEGIN DELETE FROM {table}_fts WHERE rowid = old.id; END"
+        )
+        # Индекс мог разойтись с таблицей при записи без сигналов.
+        schema_editor.execute(f"DELETE FROM {table}_fts")
+        schema_editor.execute(
+            f"INSERT INTO {table}_fts (rowid, content) "
+            f"SELECT id, {field} FROM {table}"
+        )
+
+
+def drop_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table, _ in SEARCH_FIELDS:
+        for event in ("insert", "update", "delete"):
+            schema_editor.execute(
+                f"DROP TRIGGER IF EXISTS {table}_fts_{event}"
+            )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0017_pub_date_default"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
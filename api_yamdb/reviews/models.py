@@ -1,11 +1,17 @@
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
 
+from reviews.deletion import deletion_scope
 from reviews.numbers import (
+    DEFAULT_NUM,
+    MAX_LEN_EMAIL,
     MAX_LEN_NAME,
     MAX_LEN_ROLE,
+    MAX_LEN_SCOPE,
     MAX_LEN_STR,
     MAX_LEN_USERNAME,
     MAX_SCORE,
@@ -87,6 +93,13 @@ class Genre(CategoryGenreModel):
         verbose_name_plural = "Жанры"
 
 
+class DeletionScopeQuerySet(models.QuerySet):
+    def delete(self):
+        """Удалить объекты, отмечая их в deletion_scope."""
+        with deletion_scope():
+            return super().delete()
+
+
 class Title(models.Model):
     name = models.CharField("Название", max_length=MAX_LEN_NAME)
     year = models.SmallIntegerField("Год выпуска", validators=[validate_year])
@@ -102,28 +115,81 @@ class Title(models.Model):
         verbose_name="Категория",
         related_name="titles",
     )
+    rating_sum = models.PositiveIntegerField(
+        "Сумма оценок", default=DEFAULT_NUM, editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        "Количество оценок", default=DEFAULT_NUM, editable=False
+    )
+    # Хранится отдельно, чтобы сортировать и фильтровать по индексу.
+    rating_avg = models.FloatField(
+        "Средняя оценка", default=DEFAULT_NUM, editable=False
+    )
+
+    objects = DeletionScopeQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Произведение"
         verbose_name_plural = "Произведения"
         ordering = ("-year",)
+        indexes = (
+            models.Index(fields=("-year", "id"), name="title_year_id_idx"),
+            models.Index(
+                fields=("-rating_avg", "id"), name="title_rating_id_idx"
+            ),
+            models.Index(
+                fields=("-rating_count", "id"),
+                name="title_rating_count_id_idx",
+            ),
+            models.Index(fields=("-name", "id"), name="title_name_id_idx"),
+        )
 
     def __str__(self):
         return self.name[:MAX_LEN_STR]
 
+    def delete(self, *args, **kwargs):
+        """Удалить произведение, отметив его на время удаления отзывов."""
+        with deletion_scope():
+            return super().delete(*args, **kwargs)
+
+    @property
+    def rating(self):
+        """Средняя оценка или None, если оценок нет."""
+        if not self.rating_count:
+            return None
+        return self.rating_avg
+
+
+def get_rating_avg(rating_sum, rating_count):
+    """Выражение средней оценки, 0 при отсутствии оценок."""
+    return Coalesce(
+        Cast(rating_sum, models.FloatField()) / NullIf(rating_count, 0),
+        float(DEFAULT_NUM),
+    )
+
 
 class GenreTitle(models.Model):
     title = models.ForeignKey(Title, on_delete=models.CASCADE)
-    genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
+    # Индекс по жанру покрывается уникальностью пары (genre, title).
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, db_index=False)
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=("genre", "title"), name="unique_genre_title"
+            ),
+        )
 
 
 class ReviewCommentModel(models.Model):
     text = models.TextField(
         verbose_name="Текст",
     )
+    # Не auto_now_add: дата, заданная при создании (import_csv), сохраняется.
     pub_date = models.DateTimeField(
         verbose_name="Дата публикации",
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
     )
     author = models.ForeignKey(
         User, on_delete=models.CASCADE, verbose_name="Автор"
@@ -139,6 +205,7 @@ class Review(ReviewCommentModel):
         Title,
         on_delete=models.CASCADE,
         verbose_name="Произведение",
+        db_index=False,
     )
     score = models.PositiveSmallIntegerField(
         default=None,
@@ -149,6 +216,11 @@ class Review(ReviewCommentModel):
             MaxValueValidator(MAX_SCORE),
         ],
     )
+    comment_count = models.PositiveIntegerField(
+        "Количество комментариев", default=DEFAULT_NUM, editable=False
+    )
+
+    objects = DeletionScopeQuerySet.as_manager()
 
     class Meta(ReviewCommentModel.Meta):
         verbose_name = "Отзыв"
@@ -158,11 +230,27 @@ class Review(ReviewCommentModel):
                 fields=("title", "author"), name="unique_person"
             ),
         )
+        indexes = (
+            models.Index(
+                fields=("title", "-pub_date", "id"),
+                name="review_title_pub_date_idx",
+            ),
+        )
         default_related_name = "reviews"
 
     def __str__(self):
         return self.title[:MAX_LEN_STR]
 
+    def save(self, *args, **kwargs):
+        """Сохранить отзыв вместе с пересчётом рейтинга произведения."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """Удалить отзыв, отметив его на время удаления комментариев."""
+        with deletion_scope():
+            return super().delete(*args, **kwargs)
+
 
 class Comment(ReviewCommentModel):
     review = models.ForeignKey(
@@ -170,12 +258,81 @@ class Comment(ReviewCommentModel):
         on_delete=models.CASCADE,
         related_name="comments",
         verbose_name="Отзыв",
+        db_index=False,
     )
 
     class Meta(ReviewCommentModel.Meta):
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
+        indexes = (
+            models.Index(
+                fields=("review", "-pub_date", "id"),
+                name="comment_review_pub_date_idx",
+            ),
+        )
         default_related_name = "comments"
 
     def __str__(self):
         return self.review[:MAX_LEN_STR]
+
+
+class TopTitle(models.Model):
+    """Строка таблицы лучших произведений, пересчитываемой периодически.
+
+    Каждое произведение с оценками входит в общий рейтинг (scope "")
+    и в рейтинги своей категории ("category:<slug>") и жанров
+    ("genre:<slug>").
+    """
+
+    scope = models.CharField("Рейтинг", max_length=MAX_LEN_SCOPE)
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name="top_entries",
+        verbose_name="Произведение",
+    )
+    weighted_rating = models.FloatField("Взвешенный рейтинг")
+    rating_count = models.PositiveIntegerField("Количество оценок")
+
+    class Meta:
+        verbose_name = "Место в рейтинге"
+        verbose_name_plural = "Лучшие произведения"
+        ordering = ("scope", "-weighted_rating", "title")
+        indexes = (
+            models.Index(
+                fields=("scope", "-weighted_rating", "title"),
+                name="top_title_scope_rating_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.scope}: {self.title_id}"[:MAX_LEN_STR]
+
+
+class EmailOutbox(models.Model):
+    recipient = models.EmailField("Получатель", max_length=MAX_LEN_EMAIL)
+    subject = models.CharField("Тема", max_length=MAX_LEN_NAME)
+    message = models.TextField("Текст")
+    created = models.DateTimeField("Создано", auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField(
+        "Попытки отправки", default=DEFAULT_NUM
+    )
+    next_attempt_at = models.DateTimeField(
+        "Следующая попытка", default=timezone.now
+    )
+    sent_at = models.DateTimeField("Отправлено", null=True, blank=True)
+    last_error = models.TextField("Последняя ошибка", blank=True)
+
+    class Meta:
+        verbose_name = "Письмо в очереди"
+        verbose_name_plural = "Очередь писем"
+        ordering = ("id",)
+        indexes = (
+            models.Index(
+                fields=("sent_at", "next_attempt_at"),
+                name="outbox_pending_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.recipient}: {self.subject}"[:MAX_LEN_STR]
@@ -6,3 +6,4 @@ MAX_LEN_NAME = 256
 MAX_LEN_EMAIL = 150
 MIN_SCORE = 1
 MAX_SCORE = 10
+MAX_LEN_SCOPE = 64
@@ -0,0 +1,142 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, F, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from reviews.models import Comment, Review, Title
+
+
+# Поле, по которому ищутся объекты каждой модели.
+SEARCH_FIELDS = {
+    Title: "name",
+    Review: "text",
+    Comment: "text",
+}
+
+
+def get_terms(query):
+    """Разбить поисковую строку на слова."""
+    return re.findall(r"\w+", query)
+
+
+class SearchBackend:
+    """Поиск подстрокой через LIKE, индекс не нужен."""
+
+    def search(self, queryset, query, ranked=False):
+        """Отфильтровать queryset по строке query."""
+        field = SEARCH_FIELDS[queryset.model]
+        return queryset.filter(**{f"{field}__icontains": query})
+
+    def rebuild(self, model):
+        """Перестроить индекс модели с нуля."""
+
+
+class SqliteSearchBackend(SearchBackend):
+    """Поиск по таблицам SQLite FTS5 с rowid, равным id объекта.
+
+    Находит слова, начинающиеся на слова запроса, а не любую подстроку:
+    "терм" находит "Терминатор", но не "Кибертерминатор". Таблицы
+    синхронизируют триггеры (миграция 0018), в том числе при bulk_create,
+    QuerySet.update и каскадном удалении.
+    """
+
+    @staticmethod
+    def get_table(model):
+        return f"{model._meta.db_table}_fts"
+
+    def search(self, queryset, query, ranked=False):
+        """Найти объекты, содержащие слова, начинающиеся на слова query."""
+        terms = get_terms(query)
+        if not terms:
+            return super().search(queryset, query, ranked)
+        match = " ".join(
+            '"{}"*'.format(term.replace('"', '""')) for term in terms
+        )
+        model = queryset.model
+        table = self.get_table(model)
+        queryset = queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {table} WHERE {table} MATCH %s", (match,)
+            )
+        )
+        if not ranked:
+            return queryset
+        # bm25 тем меньше, чем выше релевантность.
+        return queryset.annotate(
+            search_rank=RawSQL(
+                f"SELECT bm25({table}) FROM {table} WHERE {table} MATCH %s "
+                f"AND rowid = {model._meta.db_table}.id",
+                (match,),
+                output_field=FloatField(),
+            )
+        ).order_by("search_rank", "id")
+
+    def rebuild(self, model):
+        """Заполнить индекс текстами всех объектов модели."""
+        table = self.get_table(model)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(
+                f"INSERT INTO {table} (rowid, content) "
+                f"SELECT id, {SEARCH_FIELDS[model]} "
+                f"FROM {model._meta.db_table}"
+            )
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Поиск по tsvector и триграммам.
+
+    Индексы построены по выражениям над самой таблицей, поэтому PostgreSQL
+    поддерживает их сам и синхронизировать ничего не нужно.
+    """
+
+    def search(self, queryset, query, ranked=False):
+        """Найти объекты по словам query или по похожей подстроке."""
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+            TrigramSimilarity,
+        )
+
+        terms = get_terms(query)
+        if not terms:
+            return super().search(queryset, query, ranked)
+        field = SEARCH_FIELDS[queryset.model]
+        vector = SearchVector(field, config="simple")
+        search_query = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            config="simple",
+            search_type="raw",
+        )
+        # icontains сравнивает UPPER(поле), и триграммный индекс по самому
+        # полю не используется; ILIKE по полю индекс использует.
+        table = connection.ops.quote_name(queryset.model._meta.db_table)
+        column = connection.ops.quote_name(field)
+        pattern = "%{}%".format(re.sub(r"([\\%_])", r"\\\1", query))
+        substring = RawSQL(
+            f"{table}.{column} ILIKE %s",
+            (pattern,),
+            output_field=BooleanField(),
+        )
+        queryset = queryset.alias(
+            search_vector=vector, search_substring=substring
+        ).filter(Q(search_vector=search_query) | Q(search_substring=True))
+        if not ranked:
+            return queryset
+        return queryset.annotate(
+            search_rank=SearchRank(F("search_vector"), search_query)
+            + TrigramSimilarity(field, query)
+        ).order_by("-search_rank", "id")
+
+
+BACKENDS = {
+    "sqlite": SqliteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_search_backend():
+    """Получить поисковый бэкенд для используемой БД."""
+    return BACKENDS.get(connection.vendor, SearchBackend)()
@@ -0,0 +1,128 @@
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import Signal, receiver
+
+from reviews.deletion import is_deleting, mark_deleting
+from reviews.models import Comment, Review, Title, get_rating_avg
+
+
+# Таблица TopTitle пересобрана без сигналов отдельных строк.
+top_titles_refreshed = Signal()
+# Счётчики отзывов и комментариев пересчитаны одним UPDATE без сигналов.
+counters_recounted = Signal()
+# Строки модели sender загружены bulk_create без сигналов отдельных строк.
+rows_loaded = Signal()
+
+
+def update_rating(title_id, score_delta, count_delta=0):
+    """Изменить сумму, количество и среднее оценок одним UPDATE.
+
+    Выражения в SET читают значения полей до обновления.
+    """
+    rating_sum = F("rating_sum") + score_delta
+    rating_count = F("rating_count") + count_delta
+    Title.objects.filter(id=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating_avg=get_rating_avg(rating_sum, rating_count),
+    )
+
+
+@receiver(post_init, sender=Review)
+def remember_score(sender, instance, **kwargs):
+    """Запомнить исходную оценку, чтобы учесть её изменение.
+
+    Оценка берётся из __dict__: обращение к отложенному полю (only/defer)
+    загрузило бы её отдельным запросом для каждой строки. Рейтинг
+    обновляется только через save и delete, после QuerySet.update(score=...)
+    его нужно пересчитать командой recount.
+    """
+    instance._saved_score = instance.__dict__.get("score")
+
+
+def load_saved_score(instance):
+    """Загрузить исходную оценку и произведение, если они были отложены."""
+    if instance._state.adding or (
+        instance._saved_score is not None and "title_id" in instance.__dict__
+    ):
+        return
+    saved = (
+        Review.objects.filter(pk=instance.pk)
+        .values_list("score", "title_id")
+        .first()
+    )
+    if saved is None:
+        return
+    if instance._saved_score is None:
+        instance._saved_score = saved[0]
+    instance.__dict__.setdefault("title_id", saved[1])
+
+
+@receiver(pre_save, sender=Review)
+def load_score_before_save(sender, instance, **kwargs):
+    """Загрузить исходную оценку, если отложенную оценку изменили."""
+    if "score" in instance.__dict__:
+        load_saved_score(instance)
+
+
+@receiver(pre_delete, sender=Review)
+def load_score_before_delete(sender, instance, **kwargs):
+    """Загрузить оценку и произведение удаляемого отзыва."""
+    load_saved_score(instance)
+    # pre_delete отзыва приходит раньше post_delete его комментариев.
+    mark_deleting(instance)
+
+
+@receiver(pre_delete, sender=Title)
+def mark_title_deleting(sender, instance, **kwargs):
+    """Отметить удаляемое произведение до удаления его отзывов."""
+    mark_deleting(instance)
+
+
+@receiver(post_save, sender=Review)
+def add_score_to_rating(sender, instance, created, **kwargs):
+    """Учесть новую или изменённую оценку в рейтинге произведения."""
+    if "score" not in instance.__dict__:
+        # Отложенное поле не сохранялось и не менялось.
+        return
+    score = int(instance.score)
+    if created:
+        update_rating(instance.title_id, score, 1)
+    elif score != int(instance._saved_score):
+        update_rating(instance.title_id, score - int(instance._saved_score))
+    instance._saved_score = score
+
+
+@receiver(post_delete, sender=Review)
+def remove_score_from_rating(sender, instance, **kwargs):
+    """Исключить оценку удалённого отзыва из рейтинга произведения."""
+    if is_deleting(Title, instance.title_id):
+        # Рейтинг удаляемого произведения не нужен.
+        return
+    update_rating(instance.title_id, -int(instance._saved_score), -1)
+
+
+@receiver(post_save, sender=Comment)
+def add_comment_to_count(sender, instance, created, **kwargs):
+    """Учесть новый комментарий в счётчике отзыва."""
+    if created:
+        Review.objects.filter(id=instance.review_id).update(
+            comment_count=F("comment_count") + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def remove_comment_from_count(sender, instance, **kwargs):
+    """Исключить удалённый комментарий из счётчика отзыва."""
+    if is_deleting(Review, instance.review_id):
+        # Счётчик удаляемого отзыва не нужен.
+        return
+    Review.objects.filter(id=instance.review_id).update(
+        comment_count=F("comment_count") - 1
+    )
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def send_emails_sync(settings):
+    # Письма отправляются сразу, чтобы их можно было проверить в outbox.
+    settings.SEND_EMAILS_ASYNC = False
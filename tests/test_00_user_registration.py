@@ -375,3 +375,21 @@ class Test00UserRegistration:
             'пользователя, созданного администратором,  возвращает ответ '
             'со статусом 200.'
         )
+
+    def test_signup_concurrent_registration(self, client, django_user_model):
+        from unittest import mock
+
+        valid_data = {
+            'email': 'test_email@yamdb.fake',
+            'username': 'valid_username_1'
+        }
+        # Имя заняли параллельным запросом после проверки сериализатором.
+        with mock.patch.object(
+            django_user_model.objects, 'create', side_effect=IntegrityError
+        ):
+            response = client.post(self.URL_SIGNUP, data=valid_data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'non_field_errors' in response.json(), (
+            f'Проверьте, что ошибка регистрации на `{self.URL_SIGNUP}` из-за '
+            'параллельного запроса возвращается в ключе `non_field_errors`.'
+        )
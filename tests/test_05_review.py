@@ -1,11 +1,12 @@
 from http import HTTPStatus
 
 import pytest
+from django.core.management import call_command
 from django.db.utils import IntegrityError
 
 from tests.utils import (
-    check_fields, check_pagination, create_reviews, create_single_review,
-    create_titles
+    check_fields, check_pagination, create_comments, create_reviews,
+    create_single_review, create_titles
 )
 
 
@@ -413,3 +414,72 @@ class Test05ReviewAPI:
             f'Проверьте, что PUT-запрос к `{self.REVIEW_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_07_review_and_comment_counts(
+            self, client, admin_client, admin, user_client, user,
+            moderator_client, moderator):
+        from reviews.models import Review, Title
+
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        assert client.get(title_url).json().get('review_count') == 3, (
+            f'Проверьте, что ответ на GET-запрос к `{title_url}` содержит '
+            'поле `review_count` с количеством отзывов.'
+        )
+        assert client.get(review_url).json().get('comment_count') == 3, (
+            f'Проверьте, что ответ на GET-запрос к `{review_url}` содержит '
+            'поле `comment_count` с количеством комментариев.'
+        )
+        comment_url = f'{review_url}comments/{comments[0]["id"]}/'
+        assert admin_client.delete(comment_url).status_code == (
+            HTTPStatus.NO_CONTENT
+        )
+        assert client.get(review_url).json()['comment_count'] == 2, (
+            'Проверьте, что удаление комментария уменьшает `comment_count`.'
+        )
+        response = admin_client.patch(
+            title_url, data={'review_count': 100}, format='json'
+        )
+        assert response.json()['review_count'] == 3, (
+            'Проверьте, что поле `review_count` доступно только для чтения.'
+        )
+
+        Title.objects.update(rating_count=0)
+        Review.objects.update(comment_count=10)
+        call_command('recount')
+        assert client.get(title_url).json()['review_count'] == 3
+        assert client.get(review_url).json()['comment_count'] == 2, (
+            'Проверьте, что команда `recount` восстанавливает счётчики.'
+        )
+
+    def test_08_review_post_other_integrity_error(self, admin_client,
+                                                  user_client):
+        from unittest import mock
+
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        with mock.patch.object(
+            Review, 'save', side_effect=IntegrityError('NOT NULL')
+        ), pytest.raises(IntegrityError):
+            user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв пользователя на произведение '
+            'возвращает ответ со статусом 400, а другие нарушения '
+            'целостности БД не выдаются за повторный отзыв.'
+        )
@@ -0,0 +1,398 @@
+import re
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+import pytest
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08QueriesAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_titles_list_queries(self, admin_client, client,
+                                    django_assert_num_queries):
+        _, categories, _ = create_titles(admin_client)
+        with django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == 2
+
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.get(slug=categories[0]['slug'])
+        genres = list(Genre.objects.all())
+        for idx in range(20):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            )
+            title.genre.set(genres)
+        with django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == 10, (
+            'Проверьте, что количество запросов к БД при GET-запросе к '
+            f'`{self.TITLES_URL}` не зависит от размера страницы.'
+        )
+
+    def test_02_titles_cursor_pagination(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert 'count' in response.json(), (
+            f'Проверьте, что по умолчанию `{self.TITLES_URL}` использует '
+            'постраничную пагинацию.'
+        )
+        response = client.get(self.TITLES_URL, {'cursor': ''})
+        data = response.json()
+        assert set(data) == {'next', 'previous', 'results'}, (
+            f'Проверьте, что `{self.TITLES_URL}?cursor=` возвращает '
+            'ответ курсорной пагинации.'
+        )
+        assert [title['id'] for title in data['results']] == [
+            titles[1]['id'], titles[0]['id']
+        ]
+
+    @pytest.mark.parametrize('queryset_name, index', (
+        ('reviews', 'review_title_pub_date_idx'),
+        ('comments', 'comment_review_pub_date_idx'),
+        ('titles_by_year', 'title_year_id_idx'),
+        ('titles_by_rating', 'title_rating_id_idx'),
+        ('titles_by_review_count', 'title_rating_count_id_idx'),
+        # SQLite хранит ограничение unique_genre_title как autoindex.
+        ('titles_by_genre', 'INDEX sqlite_autoindex_reviews_genretitle_1 '
+                            '(genre_id=?)'),
+    ))
+    def test_03_lookup_indexes(self, admin_client, admin, queryset_name,
+                               index):
+        from django.db import connection
+
+        from reviews.models import Comment, GenreTitle, Review, Title
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется только для SQLite.')
+        titles, _, genres = create_titles(admin_client)
+        title = Title.objects.get(pk=titles[0]['id'])
+        for idx in range(50):
+            Title.objects.create(name=f'Произведение {idx}', year=1900 + idx)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=5
+        )
+        Comment.objects.bulk_create(
+            Comment(review=review, author=admin, text=f'Комментарий {idx}')
+            for idx in range(50)
+        )
+        querysets = {
+            'reviews': Review.objects.filter(title=title).order_by(
+                '-pub_date', 'id'
+            ),
+            'comments': Comment.objects.filter(review=review).order_by(
+                '-pub_date', 'id'
+            ),
+            'titles_by_year': Title.objects.filter(year=1984).order_by(
+                '-year', 'id'
+            ),
+            'titles_by_rating': Title.objects.filter(
+                rating_count__gt=0, rating_avg__gte=7
+            ).order_by('-rating_avg', 'id'),
+            'titles_by_review_count': Title.objects.order_by(
+                '-rating_count', 'id'
+            )[:10],
+            'titles_by_genre': GenreTitle.objects.filter(
+                genre__slug=genres[0]['slug']
+            ),
+        }
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        plan = querysets[queryset_name].explain()
+        assert index in plan, (
+            f'Проверьте, что запрос `{queryset_name}` использует индекс '
+            f'`{index}`. План запроса: {plan}'
+        )
+
+    def test_04_query_instrumentation(self, admin_client, client, settings,
+                                      caplog):
+        create_titles(admin_client)
+        settings.MIDDLEWARE = [
+            'api.middleware.QueryInstrumentationMiddleware',
+            *settings.MIDDLEWARE,
+        ]
+        settings.QUERY_BUDGETS = {'TitleViewSet': 1}
+        with caplog.at_level('INFO', logger='api.middleware'):
+            response = client.get(self.TITLES_URL)
+        timing = response['Server-Timing']
+        assert 'db;dur=' in timing and 'desc="3 queries"' in timing, (
+            'Проверьте, что заголовок `Server-Timing` содержит время и '
+            'число запросов к БД.'
+        )
+        assert 'render;dur=' in timing
+        serialize = re.search(r'serialize;dur=([\d.]+)', timing)
+        assert serialize and float(serialize.group(1)) > 0, (
+            'Проверьте, что заголовок `Server-Timing` содержит отдельное '
+            'время сериализации данных ответа.'
+        )
+        record = caplog.records[-1]
+        assert record.levelname == 'WARNING', (
+            'Проверьте, что запрос сверх бюджета представления '
+            'логируется как предупреждение.'
+        )
+        assert '"view": "TitleViewSet"' in record.getMessage()
+
+    def test_05_reviews_queries(self, admin_client, user_client, admin, user,
+                                moderator, moderator_client, client,
+                                django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        # Пользователь, произведение, BEGIN, вставка и рейтинг, поисковый
+        # индекс обновляет триггер.
+        with django_assert_num_queries(5):
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        # Пользователь, произведение, BEGIN, вставка и проверка, что
+        # ошибка вызвана повторным отзывом.
+        with django_assert_num_queries(5):
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что повторный POST-запрос к `{url}` от того же '
+            'пользователя возвращает ответ со статусом 400.'
+        )
+
+        for author_client in (admin_client, moderator_client):
+            author_client.post(url, data=data)
+        # Произведение со счётчиком отзывов и страница отзывов с авторами.
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.json()['count'] == 3
+
+    def test_06_comments_queries(self, admin_client, admin, client,
+                                 django_assert_num_queries):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        for idx in range(12):
+            admin_client.post(url, data={'text': f'Комментарий {idx}'})
+        # Отзыв со счётчиком комментариев и страница комментариев с
+        # авторами.
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.json()['count'] == 12
+
+        wrong_url = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        response = client.get(wrong_url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что GET-запрос к `{wrong_url}` для отзыва к другому '
+            'произведению возвращает ответ со статусом 404.'
+        )
+
+    def test_07_signup_queries(self, client, settings,
+                               django_assert_num_queries):
+        settings.SEND_EMAILS_ASYNC = True
+        url = '/api/v1/auth/signup/'
+        data = {'email': 'burst@yamdb.fake', 'username': 'burst'}
+        # Поиск по имени или почте, создание пользователя и письма.
+        with django_assert_num_queries(3):
+            response = client.post(url, data=data)
+        assert response.status_code == HTTPStatus.OK
+        # Повторная регистрация: поиск пользователя и письмо.
+        with django_assert_num_queries(2):
+            response = client.post(url, data=data)
+        assert response.status_code == HTTPStatus.OK
+        with django_assert_num_queries(1):
+            response = client.post(
+                url, data={'email': data['email'], 'username': 'other'}
+            )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{url}` с занятой почтой '
+            'возвращает ответ со статусом 400.'
+        )
+
+    def test_08_deferred_review_score(self, admin_client, admin, user,
+                                      django_assert_num_queries):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        for author in (admin, user):
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=4
+            )
+        with django_assert_num_queries(1):
+            texts = [review.text for review in Review.objects.only('text')]
+        assert len(texts) == 2, (
+            'Проверьте, что загрузка отзывов без поля `score` не выполняет '
+            'отдельный запрос для каждого отзыва.'
+        )
+
+        review = Review.objects.only('text').get(author=admin)
+        review.score = 10
+        review.save()
+        Review.objects.only('text').get(author=user).delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (10, 1), (
+            'Проверьте, что изменение и удаление отзыва с отложенной '
+            'оценкой учитываются в рейтинге произведения.'
+        )
+
+    @pytest.mark.parametrize('params', (
+        {},
+        {'ordering': '-rating'},
+        {'ordering': 'name'},
+    ))
+    def test_09_keyset_cursor(self, client, params):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Title
+
+        # Одинаковые год и рейтинг у всех произведений.
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx % 5}', year=2000)
+            for idx in range(25)
+        )
+        url = f'{self.TITLES_URL}?{urlencode({**params, "cursor": ""})}'
+        pages = []
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                data = client.get(url).json()
+            assert not any(
+                'OFFSET' in query['sql'].upper()
+                for query in context.captured_queries
+            ), (
+                f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+                'выбирает страницу по составному ключу, а не через OFFSET.'
+            )
+            pages.append([title['id'] for title in data['results']])
+            url = data['next']
+        ids = [title_id for page in pages for title_id in page]
+        assert sorted(ids) == sorted(Title.objects.values_list(
+            'id', flat=True
+        )), (
+            f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+            'возвращает каждое произведение ровно один раз.'
+        )
+        assert [len(page) for page in pages] == [10, 10, 5]
+        previous = client.get(data['previous']).json()
+        assert [title['id'] for title in previous['results']] == pages[1]
+
+    def test_10_review_delete_cascade(self, admin, user):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=4
+            )
+            for author in (admin, user)
+        ]
+        for review in reviews:
+            for _ in range(5):
+                Comment.objects.create(
+                    review=review, author=admin, text='Комментарий'
+                )
+        with CaptureQueriesContext(connection) as context:
+            reviews[0].delete()
+        review_table = Review._meta.db_table
+        assert not any(
+            query['sql'].startswith(f'UPDATE "{review_table}"')
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что при удалении отзыва счётчик комментариев не '
+            'обновляется для каждого удаляемого комментария.'
+        )
+        assert not any(
+            query['sql'].startswith('SELECT')
+            and f'FROM "{review_table}"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что при удалении отзыва его комментарии не '
+            'загружают отзыв по одному запросу на комментарий.'
+        )
+
+        Comment.objects.filter(review=reviews[1]).first().delete()
+        reviews[1].refresh_from_db()
+        assert reviews[1].comment_count == 4, (
+            'Проверьте, что удаление комментария уменьшает счётчик отзыва.'
+        )
+
+    def test_11_failed_review_delete(self, admin):
+        from django.db.models.signals import pre_delete
+
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=4
+        )
+        for _ in range(2):
+            Comment.objects.create(
+                review=review, author=admin, text='Комментарий'
+            )
+
+        def fail(sender, instance, **kwargs):
+            raise RuntimeError('Удаление прервано')
+
+        pre_delete.connect(fail, sender=Review)
+        try:
+            with pytest.raises(RuntimeError):
+                review.delete()
+        finally:
+            pre_delete.disconnect(fail, sender=Review)
+        Comment.objects.filter(review=review).first().delete()
+        review.refresh_from_db()
+        assert review.comment_count == 1, (
+            'Проверьте, что после неудачного удаления отзыва удаление его '
+            'комментария уменьшает счётчик комментариев.'
+        )
+
+    def test_12_title_delete_cascade(self, admin, user, moderator):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        for author in (admin, user, moderator):
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=4
+            )
+        with CaptureQueriesContext(connection) as context:
+            title.delete()
+        title_table = Title._meta.db_table
+        assert not any(
+            query['sql'].startswith(f'UPDATE "{title_table}"')
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что при удалении произведения его рейтинг не '
+            'обновляется для каждого удаляемого отзыва.'
+        )
+        assert not Review.objects.exists()
+
+    @pytest.mark.parametrize('url, position', (
+        (TITLES_URL, ['abc', 1]),
+        (TITLES_URL, [None, 1]),
+        (TITLES_URL, [[2000], {}]),
+        ('/api/v1/titles/{title_id}/reviews/', ['abc', 1]),
+    ))
+    def test_13_forged_cursor(self, client, url, position):
+        import json
+        from base64 import b64encode
+
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = url.format(title_id=title.id)
+        cursor = b64encode(
+            urlencode({'p': json.dumps(position)}).encode()
+        ).decode()
+        response = client.get(url, {'cursor': cursor})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что `{url}` с поддельным курсором возвращает 404, '
+            'а не ошибку сервера.'
+        )
@@ -0,0 +1,165 @@
+import time
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+
+from tests.utils import (
+    create_categories, create_comments, create_reviews,
+    create_single_review, create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CacheAPI:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_categories_cache(self, admin_client, client):
+        create_categories(admin_client)
+        response = client.get(self.CATEGORIES_URL)
+        assert response['X-Cache'] == 'MISS'
+        response = client.get(self.CATEGORIES_URL)
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{self.CATEGORIES_URL}` '
+            'возвращает ответ из кэша.'
+        )
+        assert response.json()['count'] == 2
+
+        admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        response = client.get(self.CATEGORIES_URL)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что изменение категорий сбрасывает кэш ответов.'
+        )
+        assert response.json()['count'] == 3
+
+        from api.cache import get_stats
+
+        assert get_stats() == {'hits': 1, 'misses': 2}
+
+    def test_02_reviews_conditional_get(self, admin_client, client,
+                                        user_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `ETag`.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным `ETag` '
+            'возвращает ответ со статусом 304.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Новый отзыв', 3)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после добавления отзыва GET-запрос к `{url}` '
+            'со старым `ETag` возвращает ответ со статусом 200.'
+        )
+        assert response.json()['count'] == 2
+
+    def test_03_cached_count(self, admin_client, client,
+                             django_assert_num_queries):
+        titles, _, genres = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?genre={genres[0]["slug"]}'
+        response = client.get(url)
+        assert response.json()['count'] == 1
+        # Страница произведений и их жанры, количество берётся из кэша.
+        with django_assert_num_queries(2):
+            response = client.get(f'{url}&page=1')
+        assert response.json()['count'] == 1
+
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Новое',
+            'year': 2000,
+            'genre': [genres[0]['slug']],
+            'category': titles[0]['category'],
+        })
+        response = client.get(url)
+        assert response.json()['count'] == 2, (
+            'Проверьте, что изменение произведений сбрасывает '
+            'закэшированное количество.'
+        )
+
+    def test_04_dummy_cache(self, admin_client, client, settings):
+        create_categories(admin_client)
+        settings.CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+            }
+        }
+        response = client.get(self.CATEGORIES_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что `{self.CATEGORIES_URL}` работает с кэшем, '
+            'который не хранит значения.'
+        )
+        assert response.json()['count'] == 2
+
+    def test_05_last_modified(self, admin_client, client, admin,
+                              user_client):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        # Last-Modified отдаётся, только когда секунда изменения прошла.
+        time.sleep(1)
+        response = client.get(url)
+        last_modified = response['Last-Modified']
+        assert last_modified, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `Last-Modified`.'
+        )
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-Modified-Since` возвращает ответ со статусом 304.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Новый отзыв', 3)
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после добавления отзыва GET-запрос к `{url}` '
+            'со старым `If-Modified-Since` возвращает ответ со статусом 200.'
+        )
+
+    def test_06_changes_without_signals(self, admin_client, client, admin,
+                                        tmp_path):
+        from django.core.management import call_command
+
+        from reviews.models import Comment, Review
+
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        etags = {
+            url: client.get(url)['ETag']
+            for url in (self.CATEGORIES_URL, reviews_url, comments_url)
+        }
+
+        Review.objects.filter(id=reviews[0]['id']).update(score=1)
+        Comment.objects.bulk_create(
+            [Comment(review_id=reviews[0]['id'], author=admin, text='Новый')]
+        )
+        call_command('recount', stdout=StringIO())
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n100,Музыка,music\n', encoding='utf-8'
+        )
+        call_command(
+            'import_csv',
+            data_dir=str(tmp_path),
+            only=['category'],
+            stdout=StringIO(),
+        )
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что изменения в обход сигналов моделей '
+                f'(QuerySet.update, bulk_create, import_csv) меняют `ETag` '
+                f'ответа `{url}`.'
+            )
@@ -0,0 +1,88 @@
+import pytest
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10SearchAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_titles_search(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        for params in ({'search': 'терминат'}, {'name': 'Терминатор'}):
+            response = client.get(self.TITLES_URL, params)
+            results = response.json()['results']
+            assert [title['id'] for title in results] == [titles[0]['id']], (
+                f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с '
+                f'параметрами {params} находит произведение по названию.'
+            )
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        response = client.get(self.TITLES_URL, {'search': 'терминат'})
+        assert response.json()['results'] == [], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'названия произведения.'
+        )
+
+    def test_02_titles_search_relevance(self, admin_client, client):
+        create_titles(admin_client)
+        from reviews.models import Title
+
+        Title.objects.create(name='Орешек', year=2000)
+        response = client.get(
+            self.TITLES_URL, {'search': 'орешек', 'ordering': 'relevance'}
+        )
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Орешек', 'Крепкий орешек'], (
+            f'Проверьте, что `{self.TITLES_URL}?ordering=relevance` '
+            'упорядочивает результаты поиска по релевантности.'
+        )
+
+    def test_03_reviews_search(self, admin_client, client, admin, user,
+                               user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url, {'search': 'number 2'})
+        results = response.json()['results']
+        assert [review['id'] for review in results] == [reviews[1]['id']], (
+            f'Проверьте, что GET-запрос к `{url}?search=` находит отзывы '
+            'по тексту.'
+        )
+
+    def test_04_index_without_signals(self, admin, client,
+                                      django_assert_max_num_queries):
+        from reviews.models import Comment, Review, Title
+
+        Title.objects.bulk_create(
+            Title(id=idx, name=f'Пикник {idx}', year=2000)
+            for idx in (1, 2)
+        )
+        Review.objects.bulk_create(
+            [Review(id=1, title_id=1, author=admin, text='Отзыв', score=5)]
+        )
+        Comment.objects.bulk_create(
+            Comment(review_id=1, author=admin, text='Комментарий')
+            for _ in range(5)
+        )
+        Title.objects.filter(id=2).update(name='Солярис')
+        response = client.get(self.TITLES_URL, {'search': 'пикник'})
+        assert [title['id'] for title in response.json()['results']] == [1], (
+            'Проверьте, что поисковый индекс обновляется при bulk_create '
+            'и QuerySet.update.'
+        )
+
+        # Отзывы и комментарии произведения удаляются без отдельного
+        # запроса к индексу для каждой строки.
+        with django_assert_max_num_queries(10):
+            Title.objects.get(id=1).delete()
+        assert not Comment.objects.exists()
+        response = client.get(self.TITLES_URL, {'search': 'пикник'})
+        assert response.json()['results'] == [], (
+            'Проверьте, что удаление произведения удаляет его из '
+            'поискового индекса.'
+        )
@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11EmailOutbox:
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_queues_email(self, client, settings):
+        from reviews.models import EmailOutbox
+
+        settings.SEND_EMAILS_ASYNC = True
+        outbox_before_count = len(mail.outbox)
+        valid_data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        response = client.post(self.URL_SIGNUP, data=valid_data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` не отправляет '
+            'письмо сразу, а ставит его в очередь.'
+        )
+        assert EmailOutbox.objects.filter(
+            recipient=valid_data['email'], sent_at__isnull=True
+        ).exists()
+
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `send_emails` отправляет письма из '
+            'очереди.'
+        )
+        assert valid_data['email'] in mail.outbox[-1].to
+        assert not EmailOutbox.objects.filter(sent_at__isnull=True).exists()
+
+    def test_02_failed_email_is_retried_later(self, settings, monkeypatch):
+        from django.core.mail.backends.locmem import EmailBackend
+
+        from reviews.models import EmailOutbox
+
+        email = EmailOutbox.objects.create(
+            recipient='retry@yamdb.fake', subject='Тема', message='Текст'
+        )
+
+        def fail(*args, **kwargs):
+            raise ConnectionError('SMTP недоступен')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', fail)
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.sent_at is None
+        assert email.attempts == 1
+        assert 'SMTP недоступен' in email.last_error
+        assert email.next_attempt_at > email.created, (
+            'Проверьте, что неотправленное письмо откладывается на потом.'
+        )
@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def stateless_auth(monkeypatch):
+    from rest_framework.views import APIView
+
+    from api.authentication import StatelessJWTAuthentication
+
+    monkeypatch.setattr(
+        APIView, 'authentication_classes', (StatelessJWTAuthentication,)
+    )
+
+
+def get_role_client(user):
+    from api.authentication import RoleAccessToken
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12StatelessAuthAPI:
+    URL_TOKEN = '/api/v1/auth/token/'
+    URL_CATEGORIES = '/api/v1/categories/'
+    URL_ME = '/api/v1/users/me/'
+
+    def test_01_token_has_claims(self, client, admin):
+        from django.contrib.auth.tokens import default_token_generator
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        response = client.post(self.URL_TOKEN, data={
+            'username': admin.username,
+            'confirmation_code': default_token_generator.make_token(admin),
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = AccessToken(response.json()['token'])
+        assert (
+            token['username'], token['role'], token['is_superuser']
+        ) == (admin.username, admin.role, admin.is_superuser), (
+            f'Проверьте, что токен от `{self.URL_TOKEN}` содержит имя, роль '
+            'и признак суперпользователя.'
+        )
+
+    def test_02_user_is_not_fetched(self, stateless_auth, admin):
+        admin_client = get_role_client(admin)
+        response = admin_client.post(
+            self.URL_CATEGORIES, data={'name': 'Фильм', 'slug': 'film'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                self.URL_CATEGORIES, data={'name': 'Книга', 'slug': 'book'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert not any(
+            'reviews_user' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что при аутентификации без состояния пользователь '
+            'не загружается из БД на каждый запрос.'
+        )
+
+    def test_03_changed_role_revokes_token(self, stateless_auth, admin):
+        admin_client = get_role_client(admin)
+        admin.role = admin.USER
+        admin.save()
+        response = admin_client.post(
+            self.URL_CATEGORIES, data={'name': 'Фильм', 'slug': 'film'}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен с устаревшей ролью отклоняется.'
+        )
+
+    def test_04_me(self, stateless_auth, user):
+        user_client = get_role_client(user)
+        response = user_client.get(self.URL_ME)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
+        response = user_client.patch(self.URL_ME, data={'bio': 'Новое'})
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert (user.bio, user.email) == ('Новое', 'testuser@yamdb.fake'), (
+            f'Проверьте, что PATCH-запрос к `{self.URL_ME}` с токеном без '
+            'состояния сохраняет пользователя целиком.'
+        )
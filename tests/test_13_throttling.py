@@ -0,0 +1,121 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture
+def throttle_rates(settings):
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': rates,
+        }
+    return set_rates
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ThrottlingAPI:
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_username_throttle(self, client, throttle_rates):
+        throttle_rates(signup_ip='10/hour', signup_username='2/hour')
+        data = {'username': 'flood', 'email': 'flood@yamdb.fake'}
+        for _ in range(2):
+            response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{self.URL_SIGNUP}` с '
+            'одним именем пользователя ограничиваются.'
+        )
+        assert int(response['Retry-After']) > 0, (
+            'Проверьте, что ответ со статусом 429 содержит заголовок '
+            '`Retry-After`.'
+        )
+        response = client.post(
+            self.URL_SIGNUP,
+            data={'username': 'other', 'email': 'other@yamdb.fake'},
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ограничение по имени не действует на других '
+            'пользователей.'
+        )
+
+    def test_02_signup_ip_throttle(self, client, throttle_rates):
+        throttle_rates(signup_ip='2/hour', signup_username='10/hour')
+        for number in range(2):
+            response = client.post(self.URL_SIGNUP, data={
+                'username': f'user{number}',
+                'email': f'user{number}@yamdb.fake',
+            })
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(
+            self.URL_SIGNUP,
+            data={'username': 'user3', 'email': 'user3@yamdb.fake'},
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{self.URL_SIGNUP}` с '
+            'одного IP-адреса ограничиваются.'
+        )
+
+    def test_03_review_create_throttle(self, admin_client, user_client,
+                                       throttle_rates):
+        titles, _, _ = create_titles(admin_client)
+        throttle_rates(write_ip='10/min', write_username='1/min')
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 5)
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 4})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{url}` от одного '
+            'пользователя ограничиваются.'
+        )
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ограничение не действует на чтение.'
+        )
+
+    def test_04_sliding_window(self, rf, throttle_rates, monkeypatch):
+        from rest_framework.request import Request
+
+        from api.throttling import IPRateThrottle
+
+        class View:
+            throttle_scope = 'test'
+
+        throttle_rates(test_ip='4/min')
+        now = [60.0]
+        monkeypatch.setattr(IPRateThrottle, 'timer', lambda self: now[0])
+        request = Request(rf.get('/'))
+        throttle = IPRateThrottle()
+        for _ in range(4):
+            assert throttle.allow_request(request, View())
+        assert not throttle.allow_request(request, View())
+        assert throttle.wait() == 75
+        # В середине следующего окна учитывается половина прошлого.
+        now[0] = 150.0
+        assert throttle.allow_request(request, View())
+        assert throttle.allow_request(request, View())
+        assert not throttle.allow_request(request, View()), (
+            'Проверьте, что лимит считается по скользящему окну.'
+        )
+        assert throttle.wait() == 15
+
+    def test_05_separate_cache(self, client, throttle_rates):
+        from django.core.cache import caches
+
+        throttle_rates(signup_ip='1/hour', signup_username='10/hour')
+        response = client.post(self.URL_SIGNUP, data={
+            'username': 'first', 'email': 'first@yamdb.fake',
+        })
+        assert response.status_code == HTTPStatus.OK
+        # Сброс кэша ответов не должен обнулять счётчики запросов.
+        caches['default'].clear()
+        response = client.post(self.URL_SIGNUP, data={
+            'username': 'second', 'email': 'second@yamdb.fake',
+        })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что счётчики ограничений хранятся в отдельном '
+            'кэше `throttle`.'
+        )
@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TopTitlesAPI:
+    TOP_URL = '/api/v1/titles/top/'
+
+    def create_rated_titles(self, admin_client, django_user_model):
+        from reviews.models import Review, Title
+
+        titles, categories, genres = create_titles(admin_client)
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(5)
+        ]
+        # Одна десятка против пяти девяток.
+        single = Title.objects.get(pk=titles[0]['id'])
+        Review.objects.create(
+            title=single, author=authors[0], text='Отзыв', score=10
+        )
+        popular = Title.objects.get(pk=titles[1]['id'])
+        for author in authors:
+            Review.objects.create(
+                title=popular, author=author, text='Отзыв', score=9
+            )
+        # Низкие оценки опускают среднюю оценку по всем произведениям.
+        low = Title.objects.create(name='Провал', year=2000)
+        for author in authors:
+            Review.objects.create(
+                title=low, author=author, text='Отзыв', score=3
+            )
+        call_command('refresh_top_titles')
+        return single, popular, low, categories, genres
+
+    def test_01_weighted_rating(self, client, admin_client,
+                                django_user_model):
+        single, popular, low, _, _ = self.create_rated_titles(
+            admin_client, django_user_model
+        )
+        response = client.get(self.TOP_URL)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [title['id'] for title in data] == [
+            popular.id, single.id, low.id
+        ], (
+            f'Проверьте, что `{self.TOP_URL}` ранжирует произведения по '
+            'взвешенному рейтингу и одна высокая оценка не поднимает '
+            'произведение на первое место.'
+        )
+        assert data[0]['weighted_rating'] > data[1]['weighted_rating']
+        assert data[0]['rating'] == 9
+
+        response = client.get(self.TOP_URL, {'min_reviews': 2})
+        assert [title['id'] for title in response.json()] == [
+            popular.id, low.id
+        ]
+        response = client.get(self.TOP_URL, {'limit': 1})
+        assert len(response.json()) == 1
+        response = client.get(self.TOP_URL, {'limit': 0})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_category_and_genre(self, client, admin_client,
+                                   django_user_model,
+                                   django_assert_num_queries):
+        single, popular, _, categories, genres = self.create_rated_titles(
+            admin_client, django_user_model
+        )
+        response = client.get(
+            self.TOP_URL, {'category': categories[0]['slug']}
+        )
+        assert [title['id'] for title in response.json()] == [single.id], (
+            f'Проверьте, что `{self.TOP_URL}` фильтрует по категории.'
+        )
+        with django_assert_num_queries(2):
+            response = client.get(
+                self.TOP_URL, {'genre': genres[2]['slug']}
+            )
+        assert [title['id'] for title in response.json()] == [popular.id], (
+            f'Проверьте, что `{self.TOP_URL}` фильтрует по жанру.'
+        )
+        response = client.get(self.TOP_URL, {
+            'genre': genres[0]['slug'], 'category': categories[1]['slug']
+        })
+        assert response.json() == []
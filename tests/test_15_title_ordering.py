@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleOrderingAPI:
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_rated_titles(self, admin_client, user_client,
+                            moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 4)
+        create_single_review(moderator_client, titles[0]['id'], 'Отзыв', 6)
+        create_single_review(user_client, titles[1]['id'], 'Отзыв', 8)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Без отзывов',
+            'year': 2000,
+            'genre': [titles[0]['genre'][0]],
+            'category': titles[0]['category'],
+        })
+        return titles[0]['id'], titles[1]['id'], response.json()['id']
+
+    def get_ids(self, client, params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return [title['id'] for title in response.json()['results']]
+
+    @pytest.mark.parametrize('ordering, expected', (
+        ('-rating', (1, 0, 2)),
+        ('rating', (2, 0, 1)),
+        ('-review_count', (0, 1, 2)),
+        ('name', (2, 1, 0)),
+        ('-year', (2, 1, 0)),
+        ('year', (0, 1, 2)),
+    ))
+    def test_01_ordering(self, client, admin_client, user_client,
+                         moderator_client, ordering, expected):
+        ids = self.create_rated_titles(
+            admin_client, user_client, moderator_client
+        )
+        assert self.get_ids(client, {'ordering': ordering}) == [
+            ids[index] for index in expected
+        ], (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметром '
+            f'`ordering={ordering}` сортирует произведения.'
+        )
+
+    def test_02_rating_filters(self, client, admin_client, user_client,
+                               moderator_client):
+        first, second, _ = self.create_rated_titles(
+            admin_client, user_client, moderator_client
+        )
+        assert self.get_ids(client, {'rating_min': 6}) == [second], (
+            f'Проверьте, что `{self.TITLES_URL}` фильтрует по `rating_min`.'
+        )
+        assert self.get_ids(client, {'rating_max': 6}) == [first], (
+            f'Проверьте, что `{self.TITLES_URL}` фильтрует по `rating_max` '
+            'и не возвращает произведения без оценок.'
+        )
+        response = client.get(self.TITLES_URL, {'rating_min': 5})
+        assert response.json()['count'] == 2
+        assert self.get_ids(
+            client, {'rating_min': 1, 'ordering': '-rating', 'cursor': ''}
+        ) == [second, first], (
+            f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+            'учитывает параметр `ordering`.'
+        )
@@ -0,0 +1,143 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def create_objects(author, count, prefix='a'):
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    category = Category.objects.create(name='Фильм', slug=f'{prefix}-film')
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'{prefix}-{idx}')
+        for idx in range(2)
+    ]
+    for idx in range(count):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5
+        )
+        Comment.objects.create(review=review, author=author, text='Текст')
+    return category
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Admin:
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context.captured_queries)
+
+    @pytest.mark.parametrize('url', (
+        '/admin/reviews/title/',
+        '/admin/reviews/review/',
+        '/admin/reviews/comment/',
+        '/admin/reviews/category/',
+        '/admin/reviews/genre/',
+        '/admin/reviews/user/',
+    ))
+    def test_01_changelist_queries(self, client, user_superuser, url):
+        client.force_login(user_superuser)
+        create_objects(user_superuser, 3)
+        few = self.count_queries(client, url)
+        create_objects(user_superuser, 20, prefix='b')
+        many = self.count_queries(client, url)
+        assert many <= few, (
+            f'Проверьте, что число запросов к БД на странице `{url}` не '
+            f'зависит от числа строк: {few} до и {many} после добавления.'
+        )
+
+    def test_02_category_change_queries(self, client, user_superuser):
+        client.force_login(user_superuser)
+        category = create_objects(user_superuser, 3)
+        url = f'/admin/reviews/category/{category.pk}/change/'
+        few = self.count_queries(client, url)
+        from reviews.models import Title
+
+        Title.objects.bulk_create(
+            Title(name=f'Ещё {idx}', year=2000, category=category)
+            for idx in range(30)
+        )
+        many = self.count_queries(client, url)
+        assert many <= few, (
+            f'Проверьте, что число запросов к БД на странице `{url}` не '
+            'зависит от числа произведений категории.'
+        )
+        response = client.get(url)
+        formset = response.context['inline_admin_formsets'][0].formset
+        assert formset.initial_form_count() == formset.max_objects, (
+            f'Проверьте, что страница `{url}` показывает только часть '
+            'произведений категории.'
+        )
+        link = f'category__id__exact={category.pk}'
+        assert link in response.content.decode(), (
+            f'Проверьте, что страница `{url}` ссылается на список всех '
+            'произведений категории.'
+        )
+
+    def test_03_review_changelist_filters(self, client, user_superuser,
+                                          user):
+        from reviews.models import Review, Title
+
+        client.force_login(user_superuser)
+        title = Title.objects.create(name='Произведение', year=2000)
+        low = Review.objects.create(
+            title=title, author=user, text='Скучная история', score=2
+        )
+        high = Review.objects.create(
+            title=title, author=user_superuser, text='Отличный фильм',
+            score=9
+        )
+        url = '/admin/reviews/review/'
+
+        def get_ids(params):
+            response = client.get(url, params)
+            assert response.status_code == HTTPStatus.OK
+            return {obj.pk for obj in response.context['cl'].result_list}
+
+        assert get_ids({'q': 'скучн'}) == {low.pk}, (
+            f'Проверьте, что поиск на странице `{url}` находит отзывы по '
+            'началу слова через поисковый индекс.'
+        )
+        assert get_ids({'q': user.username}) == {low.pk}, (
+            f'Проверьте, что поиск на странице `{url}` находит отзывы по '
+            'имени автора.'
+        )
+        assert get_ids({'author__id__exact': user_superuser.pk}) == {
+            high.pk
+        }, f'Проверьте фильтр по автору на странице `{url}`.'
+        assert get_ids({'score_range': '8-10'}) == {high.pk}, (
+            f'Проверьте фильтр по диапазону оценок на странице `{url}`.'
+        )
+        response = client.get(url)
+        assert 'admin-autocomplete' in response.content.decode(), (
+            f'Проверьте, что фильтр по автору на странице `{url}` не '
+            'выводит список всех пользователей, а использует поиск.'
+        )
+
+    def test_04_estimated_count(self, client, user_superuser, monkeypatch):
+        from reviews.admin import EstimatedCountPaginator
+
+        client.force_login(user_superuser)
+        create_objects(user_superuser, 3)
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        monkeypatch.setattr(EstimatedCountPaginator, 'estimate_threshold', 1)
+        url = '/admin/reviews/comment/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.context['cl'].result_count == 3
+        assert not any(
+            'COUNT(' in query['sql'].upper()
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что страница `{url}` берёт число строк таблицы '
+            'из статистики БД, а не считает их через COUNT(*).'
+        )
@@ -0,0 +1,127 @@
+import asyncio
+import re
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.urls import resolve
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17AsyncReadsAPI:
+
+    def create_objects(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        return (
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title_id}/',
+            reviews_url,
+            f'{reviews_url}{reviews[0]["id"]}/comments/',
+        )
+
+    def test_01_same_responses(self, admin_client, admin, user_client, user,
+                               settings):
+        urls = self.create_objects(admin_client, admin, user_client, user)
+        expected = [admin_client.get(url).json() for url in urls]
+        settings.ROOT_URLCONF = 'api_yamdb.async_urls'
+        for url, data in zip(urls, expected):
+            assert asyncio.iscoroutinefunction(resolve(url).func), (
+                f'Проверьте, что при `ASYNC_READS` запросы к `{url}` '
+                'обслуживает асинхронное представление.'
+            )
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json() == data, (
+                f'Проверьте, что асинхронное представление `{url}` '
+                'возвращает те же данные, что и синхронное.'
+            )
+        response = admin_client.post(
+            urls[0], data={'name': 'Музыка', 'slug': 'music'}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что запросы на запись к асинхронному маршруту '
+            'обрабатываются как прежде.'
+        )
+
+    def test_02_concurrent_reads(self, admin_client, admin, user_client,
+                                 user, settings):
+        from django.db.backends.signals import connection_created
+
+        from api_yamdb.benchmark import delay_queries
+
+        url = self.create_objects(admin_client, admin, user_client, user)[4]
+        delay = delay_queries(0.05)
+        threads = []
+
+        def delay_query(execute, sql, params, many, context):
+            threads.append(threading.get_ident())
+            return delay(execute, sql, params, many, context)
+
+        def slow_down(sender, connection, **kwargs):
+            if delay_query not in connection.execute_wrappers:
+                connection.execute_wrappers.append(delay_query)
+
+        async def fetch(count):
+            client = AsyncClient()
+            return await asyncio.gather(
+                *(client.get(url) for _ in range(count))
+            )
+
+        def measure():
+            # Прогрев: количество отзывов берётся из кэша в обоих режимах.
+            async_to_sync(fetch)(1)
+            threads.clear()
+            started = time.perf_counter()
+            responses = async_to_sync(fetch)(8)
+            assert all(
+                response.status_code == HTTPStatus.OK
+                for response in responses
+            )
+            return time.perf_counter() - started
+
+        # Асинхронные чтения открывают соединения в потоках пула.
+        connection_created.connect(slow_down)
+        try:
+            with connection.execute_wrapper(delay_query):
+                sync_duration = measure()
+                settings.ROOT_URLCONF = 'api_yamdb.async_urls'
+                async_duration = measure()
+        finally:
+            connection_created.disconnect(slow_down)
+        assert set(threads) - {threading.get_ident()}, (
+            'Проверьте, что асинхронные чтения выполняют запросы к БД '
+            'в потоках пула.'
+        )
+        assert async_duration < sync_duration / 2, (
+            f'Проверьте, что асинхронные запросы к `{url}` ожидают БД '
+            f'параллельно: {async_duration:.2f} с против '
+            f'{sync_duration:.2f} с у синхронных.'
+        )
+
+    def test_03_query_instrumentation(self, admin_client, admin, user_client,
+                                      user, client, settings):
+        url = self.create_objects(admin_client, admin, user_client, user)[4]
+        settings.MIDDLEWARE = [
+            'api.middleware.QueryInstrumentationMiddleware',
+            *settings.MIDDLEWARE,
+        ]
+        expected = client.get(url)['Server-Timing']
+        settings.ROOT_URLCONF = 'api_yamdb.async_urls'
+        timing = client.get(url)['Server-Timing']
+        queries = re.search(r'desc="(\d+) queries"', timing)
+        assert queries and queries.group(0) in expected, (
+            f'Проверьте, что запросы к БД асинхронного представления `{url}` '
+            'учитываются в заголовке `Server-Timing`.'
+        )
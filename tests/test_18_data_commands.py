@@ -0,0 +1,109 @@
+import csv
+import re
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+def generate(data_dir, seed):
+    call_command(
+        'generate_fake_data',
+        users=8,
+        categories=2,
+        genres=4,
+        titles=6,
+        max_reviews_per_title=5,
+        comments_per_review=1,
+        seed=seed,
+        output_dir=str(data_dir),
+        stdout=StringIO(),
+    )
+
+
+def read_csv(data_dir, name):
+    with open(data_dir / name, encoding='utf-8') as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18DataCommands:
+
+    def test_01_generate_fake_data_seed(self, tmp_path):
+        from reviews.management.commands.import_csv import TABLES
+
+        generate(tmp_path / 'first', seed=3)
+        generate(tmp_path / 'second', seed=3)
+        generate(tmp_path / 'other', seed=4)
+        files = [csv_file for _, csv_file, _ in TABLES.values()]
+        for csv_file in files:
+            assert (
+                (tmp_path / 'first' / csv_file).read_bytes()
+                == (tmp_path / 'second' / csv_file).read_bytes()
+            ), (
+                'Проверьте, что `generate_fake_data` с одинаковым `--seed` '
+                f'создаёт одинаковый файл `{csv_file}`.'
+            )
+        assert any(
+            (tmp_path / 'first' / csv_file).read_bytes()
+            != (tmp_path / 'other' / csv_file).read_bytes()
+            for csv_file in files
+        ), 'Проверьте, что `--seed` влияет на сгенерированные данные.'
+
+    def test_02_generated_data_imports(self, tmp_path):
+        from reviews.models import Comment, Review, Title
+
+        generate(tmp_path, seed=1)
+        out = StringIO()
+        call_command('import_csv', data_dir=str(tmp_path), stdout=out)
+        skipped = re.findall(r'пропущено (\d+)', out.getvalue())
+        assert skipped and set(skipped) == {'0'}, (
+            'Проверьте, что `import_csv` загружает все строки, '
+            'сгенерированные `generate_fake_data`.'
+        )
+        reviews = read_csv(tmp_path, 'review.csv')
+        assert Title.objects.count() == len(read_csv(tmp_path, 'titles.csv'))
+        assert Review.objects.count() == len(reviews)
+        assert Comment.objects.count() == len(
+            read_csv(tmp_path, 'comments.csv')
+        )
+        review = Review.objects.get(pk=reviews[0]['id'])
+        assert review.pub_date.isoformat() == reviews[0]['pub_date'], (
+            'Проверьте, что `import_csv` сохраняет дату публикации из csv.'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        assert title.rating_count == Review.objects.filter(
+            title=title
+        ).count()
+
+    def test_03_import_rerun_counts_inserted_rows(self, tmp_path):
+        generate(tmp_path, seed=2)
+        call_command('import_csv', data_dir=str(tmp_path), stdout=StringIO())
+        out = StringIO()
+        call_command('import_csv', data_dir=str(tmp_path), stdout=out)
+        inserted = re.findall(r'вставлено (\d+)', out.getvalue())
+        assert inserted and set(inserted) == {'0'}, (
+            'Проверьте, что повторный `import_csv` сообщает число '
+            'вставленных, а не обработанных строк.'
+        )
+
+    def test_04_import_sends_recount_signal(self, tmp_path):
+        from reviews.signals import counters_recounted
+
+        senders = []
+
+        def receiver(sender, **kwargs):
+            senders.append(sender)
+
+        generate(tmp_path, seed=5)
+        counters_recounted.connect(receiver)
+        try:
+            call_command(
+                'import_csv', data_dir=str(tmp_path), stdout=StringIO()
+            )
+        finally:
+            counters_recounted.disconnect(receiver)
+        assert senders, (
+            'Проверьте, что `import_csv` после пересчёта счётчиков '
+            'отправляет сигнал `counters_recounted`.'
+        )